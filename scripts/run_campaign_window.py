@@ -12,6 +12,7 @@ import sys
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 try:
     from dotenv import load_dotenv
@@ -25,6 +26,9 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+if TYPE_CHECKING:
+    from leadgen.pipeline_runner import LeadPipelineRunner
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Roda campanha por janela de tempo com ciclos automáticos.")
@@ -359,6 +363,13 @@ def main() -> int:
     from leadgen.pipeline_runner import LeadPipelineRunner
 
     runner = LeadPipelineRunner()
+    try:
+        return _run_window(args, runner)
+    finally:
+        runner.close()
+
+
+def _run_window(args: argparse.Namespace, runner: LeadPipelineRunner) -> int:
     run_id = datetime.now(timezone.utc).strftime("window-%Y%m%dT%H%M%SZ")
     deadline = datetime.now(timezone.utc) + timedelta(minutes=args.minutes)
     if args.force_resume_scrape:
@@ -49,15 +49,15 @@ def main() -> int:
 
     from leadgen.runner import LeadGeneratorRunner
 
-    runner = LeadGeneratorRunner()
-    files = runner.run(
-        audience=args.audience,
-        location=args.location,
-        max_results=args.max_results,
-        out_format=args.format,
-        headless=not args.headful,
-        enrich_website=args.enrich_website,
-    )
+    with LeadGeneratorRunner() as runner:
+        files = runner.run(
+            audience=args.audience,
+            location=args.location,
+            max_results=args.max_results,
+            out_format=args.format,
+            headless=not args.headful,
+            enrich_website=args.enrich_website,
+        )
     for file_path in files:
         print(file_path)
     return 0
@@ -76,80 +76,79 @@ def main() -> int:
 
     from leadgen.pipeline_runner import LeadPipelineRunner
 
-    runner = LeadPipelineRunner()
-
-    if args.command == "run-all":
-        summary = runner.run_all(
-            audience=args.audience,
-            location=args.location,
-            max_results=args.max_results,
-            headless=not args.headful,
-            enrich_website=args.enrich_website,
-            payment_url=args.payment_url,
-        )
-        print(
-            f"run_id={summary.run_id} leads_ingested={summary.leads_ingested} "
-            f"consent_sent={summary.consent_sent} followups_sent={summary.followups_sent} offers_sent={summary.offers_sent}"
-        )
-        return 0
-
-    if args.command == "ingest":
-        n = runner.ingest(
-            run_id=args.run_id,
-            audience=args.audience,
-            location=args.location,
-            max_results=args.max_results,
-            headless=not args.headful,
-            enrich_website=args.enrich_website,
-        )
-        print(f"ingested={n}")
-        return 0
-
-    if args.command == "outreach":
-        sent = runner.send_initial_outreach(run_id=args.run_id)
-        print(f"consent_sent={sent}")
-        return 0
-
-    if args.command == "followups":
-        sent = runner.send_followups(run_id=args.run_id)
-        print(f"followups_sent={sent}")
-        return 0
-
-    if args.command == "offers":
-        sent = runner.send_offers_for_consented(run_id=args.run_id, payment_url=args.payment_url)
-        print(f"offers_sent={sent}")
-        return 0
-
-    if args.command == "reply":
-        runner.process_reply(run_id=args.run_id, lead_id=args.lead_id, channel=args.channel, text=args.text)
-        print("reply_processed=1")
-        return 0
-
-    if args.command == "email-feedback":
-        runner.register_email_feedback(bounces=args.bounces, complaints=args.complaints, sent=args.sent)
-        print("email_feedback_recorded=1")
-        return 0
-
-    if args.command == "sales-mark":
-        info = runner.mark_sale(
-            run_id=args.run_id,
-            lead_id=args.lead_id,
-            accepted_plan=args.accepted_plan,
-            reason=args.reason,
-        )
-        print(
-            f"sale_marked=1 lead_id={args.lead_id} accepted_plan={info['accepted_plan']} "
-            f"sale_amount={info['sale_amount']} new_level={info['new_level']} "
-            f"price_full={info['price_full']} price_simple={info['price_simple']}"
-        )
-        return 0
-
-    if args.command == "close-stale":
-        n = runner.close_stale_sequences(run_id=args.run_id)
-        print(f"closed_lost={n}")
-        return 0
-
-    return 1
+    with LeadPipelineRunner() as runner:
+        if args.command == "run-all":
+            summary = runner.run_all(
+                audience=args.audience,
+                location=args.location,
+                max_results=args.max_results,
+                headless=not args.headful,
+                enrich_website=args.enrich_website,
+                payment_url=args.payment_url,
+            )
+            print(
+                f"run_id={summary.run_id} leads_ingested={summary.leads_ingested} "
+                f"consent_sent={summary.consent_sent} followups_sent={summary.followups_sent} offers_sent={summary.offers_sent}"
+            )
+            return 0
+
+        if args.command == "ingest":
+            n = runner.ingest(
+                run_id=args.run_id,
+                audience=args.audience,
+                location=args.location,
+                max_results=args.max_results,
+                headless=not args.headful,
+                enrich_website=args.enrich_website,
+            )
+            print(f"ingested={n}")
+            return 0
+
+        if args.command == "outreach":
+            sent = runner.send_initial_outreach(run_id=args.run_id)
+            print(f"consent_sent={sent}")
+            return 0
+
+        if args.command == "followups":
+            sent = runner.send_followups(run_id=args.run_id)
+            print(f"followups_sent={sent}")
+            return 0
+
+        if args.command == "offers":
+            sent = runner.send_offers_for_consented(run_id=args.run_id, payment_url=args.payment_url)
+            print(f"offers_sent={sent}")
+            return 0
+
+        if args.command == "reply":
+            runner.process_reply(run_id=args.run_id, lead_id=args.lead_id, channel=args.channel, text=args.text)
+            print("reply_processed=1")
+            return 0
+
+        if args.command == "email-feedback":
+            runner.register_email_feedback(bounces=args.bounces, complaints=args.complaints, sent=args.sent)
+            print("email_feedback_recorded=1")
+            return 0
+
+        if args.command == "sales-mark":
+            info = runner.mark_sale(
+                run_id=args.run_id,
+                lead_id=args.lead_id,
+                accepted_plan=args.accepted_plan,
+                reason=args.reason,
+            )
+            print(
+                f"sale_marked=1 lead_id={args.lead_id} accepted_plan={info['accepted_plan']} "
+                f"sale_amount={info['sale_amount']} new_level={info['new_level']} "
+                f"price_full={info['price_full']} price_simple={info['price_simple']}"
+            )
+            return 0
+
+        if args.command == "close-stale":
+            n = runner.close_stale_sequences(run_id=args.run_id)
+            print(f"closed_lost={n}")
+            return 0
+
+        return 1
 
 
 if __name__ == "__main__":
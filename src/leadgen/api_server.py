@@ -705,4 +705,8 @@ class LeadgenApiHandler(BaseHTTPRequestHandler):
 
 def run_server(host: str = "0.0.0.0", port: int = 8787) -> None:
     httpd = ThreadingHTTPServer((host, port), LeadgenApiHandler)
-    httpd.serve_forever()
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        LeadgenApiHandler.store.close()
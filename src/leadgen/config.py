@@ -5,6 +5,16 @@ from dataclasses import dataclass
 from pathlib import Path
 
 
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    # Unset, blank or malformed values fall back to the default instead of failing mid-run.
+    raw = os.getenv(name, "").strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = default
+    return max(minimum, value)
+
+
 @dataclass(frozen=True)
 class IncidentPolicy:
     window_min: int = int(os.getenv("LEADGEN_INCIDENT_WINDOW_MIN", "15"))
@@ -22,6 +32,8 @@ class AppConfig:
     ops_state_db: Path = Path(os.getenv("LEADGEN_OPS_STATE_DB", "./logs/ops_state.db"))
     preview_dir: Path = Path(os.getenv("LEADGEN_PREVIEW_DIR", "./output/previews"))
     timezone: str = os.getenv("LEADGEN_TIMEZONE", "UTC")
+    enrich_workers: int = _env_int("LEADGEN_ENRICH_WORKERS", 8)
+    scrape_pages: int = _env_int("LEADGEN_SCRAPE_PAGES", 1)
     incident: IncidentPolicy = IncidentPolicy()
 
 
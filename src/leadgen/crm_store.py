@@ -4,12 +4,14 @@ import hashlib
 import os
 import re
 import sqlite3
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from .email_validation import is_valid_email_candidate, normalize_email
+from .sqlite_utils import ThreadLocalConnections
 from .time_utils import UTC
 
 
@@ -68,7 +70,7 @@ def _extract_first_valid_email(raw_value: str) -> str:
     return ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Lead:
     id: int
     run_id: str
@@ -99,6 +101,18 @@ def _infer_country_code(phone: str, address: str) -> str:
     return ""
 
 
+@dataclass(frozen=True)
+class TouchRow:
+    lead_id: int
+    channel: str
+    intent: str
+    template_id: str
+    status: str
+    provider_message_id: str
+    body: str
+    timestamp_utc: str
+
+
 @dataclass
 class PricingState:
     price_level: int
@@ -128,12 +142,19 @@ class CrmStore:
     def __init__(self, db_path: Path) -> None:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conns = ThreadLocalConnections(self.db_path, row_factory=sqlite3.Row)
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self._conns.get()
+
+    def close(self) -> None:
+        """Close the SQLite connections opened by every thread; the store reconnects if used again."""
+        self._conns.close_all()
+
+    def transaction(self) -> AbstractContextManager[sqlite3.Connection]:
+        """Group several store calls from this thread into one transaction with a single commit."""
+        return self._conns.transaction()
 
     @staticmethod
     def _now() -> datetime:
@@ -473,101 +494,81 @@ class CrmStore:
         return int(row[0]) if row else 0
 
     def list_leads_for_initial_contact(self, limit: int = 100, run_id_prefix: str = "") -> list[Lead]:
-        with self._connect() as conn:
+        return list(self.iter_leads_for_initial_contact(limit=limit, run_id_prefix=run_id_prefix, page_size=limit))
+
+    def iter_leads_for_initial_contact(self, limit: int = 100, run_id_prefix: str = "", page_size: int = 25) -> Iterator[Lead]:
+        # EMAIL leads first, then WHATSAPP, each by id (same order as the old CASE ... ORDER BY).
+        remaining = limit
+        for channel in ("EMAIL", "WHATSAPP"):
+            where = "stage IN ('NEW', 'QUALIFIED') AND opt_out = 0 AND channel_preferred = ?"
+            params: list[Any] = [channel]
             if run_id_prefix.strip():
-                rows = conn.execute(
-                    """
-                    SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                    FROM leads
-                    WHERE stage IN ('NEW', 'QUALIFIED')
-                      AND opt_out = 0
-                      AND channel_preferred IN ('EMAIL', 'WHATSAPP')
-                      AND run_id LIKE ?
-                    ORDER BY CASE WHEN channel_preferred='EMAIL' THEN 0 ELSE 1 END, id ASC LIMIT ?
-                    """,
-                    (f"{run_id_prefix}%", limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                    FROM leads
-                    WHERE stage IN ('NEW', 'QUALIFIED') AND opt_out = 0 AND channel_preferred IN ('EMAIL', 'WHATSAPP')
-                    ORDER BY CASE WHEN channel_preferred='EMAIL' THEN 0 ELSE 1 END, id ASC LIMIT ?
-                    """,
-                    (limit,),
-                ).fetchall()
-        return [Lead(*self._normalize_lead_row(row)) for row in rows]
+                where += " AND run_id LIKE ?"
+                params.append(f"{run_id_prefix}%")
+            for lead in self._iter_leads(where, params, limit=remaining, page_size=page_size):
+                remaining -= 1
+                yield lead
+            if remaining <= 0:
+                return
 
     def list_leads_for_identity_probe(self, limit: int = 100, run_id_prefix: str = "") -> list[Lead]:
-        with self._connect() as conn:
-            params: list[Any] = []
-            if run_id_prefix.strip():
-                sql = """
-                    SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                    FROM leads
-                    WHERE stage IN ('NEW', 'QUALIFIED')
-                      AND opt_out = 0
-                      AND channel_preferred = 'EMAIL'
-                      AND trim(COALESCE(email, '')) != ''
-                      AND approach_version = 'v2_identity_probe'
-                      AND run_id LIKE ?
-                    ORDER BY id ASC LIMIT ?
-                """
-                params.extend([f"{run_id_prefix}%", limit])
-            else:
-                sql = """
-                    SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                    FROM leads
-                    WHERE stage IN ('NEW', 'QUALIFIED')
-                      AND opt_out = 0
-                      AND channel_preferred = 'EMAIL'
-                      AND trim(COALESCE(email, '')) != ''
-                      AND approach_version = 'v2_identity_probe'
-                    ORDER BY id ASC LIMIT ?
-                """
-                params.append(limit)
-            rows = conn.execute(sql, params).fetchall()
-        return [Lead(*self._normalize_lead_row(row)) for row in rows]
+        return list(self.iter_leads_for_identity_probe(limit=limit, run_id_prefix=run_id_prefix, page_size=limit))
+
+    def iter_leads_for_identity_probe(self, limit: int = 100, run_id_prefix: str = "", page_size: int = 25) -> Iterator[Lead]:
+        where = """
+            stage IN ('NEW', 'QUALIFIED')
+            AND opt_out = 0
+            AND channel_preferred = 'EMAIL'
+            AND trim(COALESCE(email, '')) != ''
+            AND approach_version = 'v2_identity_probe'
+        """
+        params: list[Any] = []
+        if run_id_prefix.strip():
+            where += " AND run_id LIKE ?"
+            params.append(f"{run_id_prefix}%")
+        return self._iter_leads(where, params, limit=limit, page_size=page_size)
 
     def list_leads_for_offer(self, limit: int = 100) -> list[Lead]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                FROM leads
-                WHERE stage = 'CONSENTED' AND opt_out = 0
-                ORDER BY id ASC LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [Lead(*self._normalize_lead_row(row)) for row in rows]
+        return list(self.iter_leads_for_offer(limit=limit, page_size=limit))
+
+    def iter_leads_for_offer(self, limit: int = 100, page_size: int = 25) -> Iterator[Lead]:
+        return self._iter_leads("stage = 'CONSENTED' AND opt_out = 0", [], limit=limit, page_size=page_size)
 
     def list_leads_waiting_reply(self, limit: int = 100) -> list[Lead]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                FROM leads
-                WHERE stage = 'WAITING_REPLY' AND opt_out = 0
-                ORDER BY id ASC LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [Lead(*self._normalize_lead_row(row)) for row in rows]
+        return list(self.iter_leads_waiting_reply(limit=limit, page_size=limit))
+
+    def iter_leads_waiting_reply(self, limit: int = 100, page_size: int = 25) -> Iterator[Lead]:
+        return self._iter_leads("stage = 'WAITING_REPLY' AND opt_out = 0", [], limit=limit, page_size=page_size)
 
     def list_leads_by_stage(self, stage: str, limit: int = 100) -> list[Lead]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
-                FROM leads
-                WHERE stage = ? AND opt_out = 0
-                ORDER BY id ASC LIMIT ?
-                """,
-                (stage, limit),
-            ).fetchall()
-        return [Lead(*self._normalize_lead_row(row)) for row in rows]
+        return list(self.iter_leads_by_stage(stage, limit=limit, page_size=limit))
+
+    def iter_leads_by_stage(self, stage: str, limit: int = 100, page_size: int = 25) -> Iterator[Lead]:
+        return self._iter_leads("stage = ? AND opt_out = 0", [stage], limit=limit, page_size=page_size)
+
+    def _iter_leads(self, where: str, params: list[Any], limit: int, page_size: int = 25) -> Iterator[Lead]:
+        # Keyset pages instead of one live cursor: callers write to this DB while iterating, and an
+        # open read statement would hold the SHARED lock and make those writes fail with "database is locked".
+        remaining = limit
+        last_id = 0
+        page = max(1, page_size)
+        while remaining > 0:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT id, run_id, business_name, maps_url, phone, email, website, address, stage, channel_preferred, opt_out
+                    FROM leads
+                    WHERE {where} AND id > ?
+                    ORDER BY id ASC LIMIT ?
+                    """,
+                    (*params, last_id, min(page, remaining)),
+                ).fetchall()
+            for row in rows:
+                yield Lead(*self._normalize_lead_row(row))
+            if len(rows) < min(page, remaining):
+                return
+            last_id = int(rows[-1][0])
+            remaining -= len(rows)
 
     def update_stage(self, lead_id: int, stage: str) -> None:
         now = self._now().isoformat()
@@ -805,13 +806,31 @@ class CrmStore:
         body: str,
     ) -> None:
         ts = self._now().isoformat()
+        self.save_touches_bulk([TouchRow(lead_id, channel, intent, template_id, status, provider_message_id, body, ts)])
+
+    def save_touches_bulk(self, rows: list[TouchRow]) -> None:
+        if not rows:
+            return
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
-                INSERT INTO touches (lead_id, channel, intent, template_id, status, provider_message_id, body, timestamp_utc)
+                INSERT INTO touches
+                    (lead_id, channel, intent, template_id, status, provider_message_id, body, timestamp_utc)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (lead_id, channel, intent, template_id, status, provider_message_id, body, ts),
+                [
+                    (
+                        r.lead_id,
+                        r.channel,
+                        r.intent,
+                        r.template_id,
+                        r.status,
+                        r.provider_message_id,
+                        r.body,
+                        r.timestamp_utc,
+                    )
+                    for r in rows
+                ],
             )
             conn.commit()
 
@@ -831,6 +850,25 @@ class CrmStore:
             ).fetchone()
         return str(row[0]) if row and row[0] else ""
 
+    def get_first_touch_epoch(self, lead_id: int, intent: str) -> int:
+        # Derived from timestamp_utc on read, so it cannot drift from the stored timestamp.
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT CAST(strftime('%s', timestamp_utc) AS INTEGER), timestamp_utc
+                FROM touches
+                WHERE lead_id=? AND intent=?
+                ORDER BY id ASC
+                LIMIT 1
+                """,
+                (lead_id, intent),
+            ).fetchone()
+        if not row or not row[1]:
+            return 0
+        if row[0] is not None:
+            return int(row[0])
+        return int(datetime.fromisoformat(str(row[1])).timestamp())
+
     def get_latest_touch(self, lead_id: int, intent: str) -> sqlite3.Row | None:
         with self._connect() as conn:
             row = conn.execute(
@@ -867,7 +905,7 @@ class CrmStore:
     def register_opt_out(self, contact: str, channel: str, reason: str) -> None:
         ts = self._now().isoformat()
         normalized_contact = normalize_email(contact) if channel == "EMAIL" else str(contact or "").strip()
-        contact_hash = hashlib.sha256(normalized_contact.encode("utf-8")).hexdigest()
+        contact_hash, _ = self.opt_out_key(contact, channel)
         with self._connect() as conn:
             conn.execute(
                 "INSERT OR IGNORE INTO opt_outs (contact_hash, channel, reason, timestamp_utc) VALUES (?, ?, ?, ?)",
@@ -879,16 +917,25 @@ class CrmStore:
             )
             conn.commit()
 
-    def is_opted_out(self, contact: str, channel: str) -> bool:
+    @staticmethod
+    def opt_out_key(contact: str, channel: str) -> tuple[str, str]:
         normalized_contact = normalize_email(contact) if channel == "EMAIL" else str(contact or "").strip()
-        contact_hash = hashlib.sha256(normalized_contact.encode("utf-8")).hexdigest()
+        return hashlib.sha256(normalized_contact.encode("utf-8")).hexdigest(), channel
+
+    def is_opted_out(self, contact: str, channel: str) -> bool:
         with self._connect() as conn:
             row = conn.execute(
                 "SELECT 1 FROM opt_outs WHERE contact_hash=? AND channel=?",
-                (contact_hash, channel),
+                self.opt_out_key(contact, channel),
             ).fetchone()
         return row is not None
 
+    def load_opt_out_set(self) -> set[tuple[str, str]]:
+        # Opt-outs are a tiny fraction of the list; send phases load them once and check opt_out_key() in memory.
+        with self._connect() as conn:
+            rows = conn.execute("SELECT contact_hash, channel FROM opt_outs").fetchall()
+        return {(str(r[0]), str(r[1])) for r in rows}
+
     @staticmethod
     def _contact_hash(contact: str) -> str:
         return hashlib.sha256((contact or "").strip().lower().encode("utf-8")).hexdigest()
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from dataclasses import dataclass
+from typing import Iterable
 from urllib.error import URLError
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
@@ -22,186 +24,213 @@ class EnrichmentResult:
     html: str
 
 
-def enrich_with_website_contacts(rows: list[dict], logger: JsonlLogger, run_id: str, store=None) -> list[dict]:
-    enriched: list[dict] = []
-    external_enabled = os.getenv("LEADGEN_EXTERNAL_ENRICH_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
-    external_max = int(os.getenv("LEADGEN_EXTERNAL_ENRICH_MAX_CANDIDATES", "5") or "5")
-    external_timeout = int(os.getenv("LEADGEN_EXTERNAL_ENRICH_TIMEOUT_SECONDS", "12") or "12")
-    min_score = float(os.getenv("LEADGEN_EMAIL_MIN_SCORE", "0.70") or "0.70")
-    for row in rows:
-        website = str(row.get("website", "")).strip()
-        all_candidates: list[ContactCandidate] = []
-        if not _is_valid_http_url(website):
+def enrich_with_website_contacts(
+    rows: Iterable[dict],
+    logger: JsonlLogger,
+    run_id: str,
+    store=None,
+    max_workers: int = 1,
+) -> list[dict]:
+    # `rows` may be a generator still being produced by the scraper; with max_workers > 1 each row
+    # is enriched in a worker thread as soon as it arrives, so scraping and enrichment overlap.
+    settings = _EnrichmentSettings(
+        external_enabled=os.getenv("LEADGEN_EXTERNAL_ENRICH_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"},
+        external_max=int(os.getenv("LEADGEN_EXTERNAL_ENRICH_MAX_CANDIDATES", "5") or "5"),
+        external_timeout=int(os.getenv("LEADGEN_EXTERNAL_ENRICH_TIMEOUT_SECONDS", "12") or "12"),
+        min_score=float(os.getenv("LEADGEN_EMAIL_MIN_SCORE", "0.70") or "0.70"),
+    )
+    if max_workers <= 1:
+        return [_enrich_row(row, logger, run_id, store, settings) for row in rows]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich") as pool:
+        futures = [pool.submit(_enrich_row, row, logger, run_id, store, settings) for row in rows]
+        return [future.result() for future in futures]
+
+
+@dataclass(frozen=True)
+class _EnrichmentSettings:
+    external_enabled: bool
+    external_max: int
+    external_timeout: int
+    min_score: float
+
+
+def _enrich_row(row: dict, logger: JsonlLogger, run_id: str, store, settings: _EnrichmentSettings) -> dict:
+    external_enabled = settings.external_enabled
+    external_max = settings.external_max
+    external_timeout = settings.external_timeout
+    min_score = settings.min_score
+    website = str(row.get("website", "")).strip()
+    all_candidates: list[ContactCandidate] = []
+    if not _is_valid_http_url(website):
+        row["website_emails"] = ""
+        row["website_phones"] = ""
+        row["enrichment_provider"] = ""
+    else:
+        try:
+            fetched = _fetch_website_html(website)
+            emails = sorted(set(EMAIL_RE.findall(fetched.html)))
+            phones = sorted(set(PHONE_RE.findall(fetched.html)))
+            row["website_emails"] = ", ".join(emails[:10])
+            row["website_phones"] = ", ".join(phones[:10])
+            row["enrichment_provider"] = fetched.provider
+            for email in emails[:10]:
+                all_candidates.append(
+                    ContactCandidate(
+                        email=email.lower(),
+                        source_type="website",
+                        source_name=fetched.provider,
+                        source_url=website,
+                        confidence=0.50,
+                    )
+                )
+            logger.write(
+                "lead_enriched",
+                {
+                    "run_id": run_id,
+                    "website": website,
+                    "provider": fetched.provider,
+                    "emails_found": len(emails),
+                    "phones_found": len(phones),
+                },
+            )
+        except Exception as exc:
             row["website_emails"] = ""
             row["website_phones"] = ""
             row["enrichment_provider"] = ""
-        else:
-            try:
-                fetched = _fetch_website_html(website)
-                emails = sorted(set(EMAIL_RE.findall(fetched.html)))
-                phones = sorted(set(PHONE_RE.findall(fetched.html)))
-                row["website_emails"] = ", ".join(emails[:10])
-                row["website_phones"] = ", ".join(phones[:10])
-                row["enrichment_provider"] = fetched.provider
-                for email in emails[:10]:
-                    all_candidates.append(
-                        ContactCandidate(
-                            email=email.lower(),
-                            source_type="website",
-                            source_name=fetched.provider,
-                            source_url=website,
-                            confidence=0.50,
-                        )
-                    )
-                logger.write(
-                    "lead_enriched",
-                    {
-                        "run_id": run_id,
-                        "website": website,
-                        "provider": fetched.provider,
-                        "emails_found": len(emails),
-                        "phones_found": len(phones),
-                    },
-                )
-            except Exception as exc:
-                row["website_emails"] = ""
-                row["website_phones"] = ""
-                row["enrichment_provider"] = ""
-                logger.write(
-                    "lead_enrichment_failed",
-                    {
-                        "run_id": run_id,
-                        "website": website,
-                        "error_type": exc.__class__.__name__,
-                        "message": str(exc),
-                    },
-                )
+            logger.write(
+                "lead_enrichment_failed",
+                {
+                    "run_id": run_id,
+                    "website": website,
+                    "error_type": exc.__class__.__name__,
+                    "message": str(exc),
+                },
+            )
 
-        country_code = str(row.get("country_code", "") or "").strip().upper()
-        niche = str(row.get("audience", "") or "").strip()
-        if external_enabled:
+    country_code = str(row.get("country_code", "") or "").strip().upper()
+    niche = str(row.get("audience", "") or "").strip()
+    if external_enabled:
+        logger.write(
+            "lead_contact_source_checked",
+            {
+                "run_id": run_id,
+                "business_name": str(row.get("name", "") or "").strip(),
+                "country_code": country_code,
+                "niche": niche,
+                "source_pack": os.getenv("LEADGEN_COUNTRY_SOURCE_PACK", "directory_council"),
+            },
+        )
+        external_candidates = fetch_contacts_for_lead(
+            lead=row,
+            niche=niche,
+            country_code=country_code,
+            max_candidates=max(1, external_max),
+            timeout_seconds=max(2, external_timeout),
+        )
+        for cand in external_candidates:
             logger.write(
-                "lead_contact_source_checked",
+                "lead_contact_candidate_found",
                 {
                     "run_id": run_id,
                     "business_name": str(row.get("name", "") or "").strip(),
                     "country_code": country_code,
-                    "niche": niche,
-                    "source_pack": os.getenv("LEADGEN_COUNTRY_SOURCE_PACK", "directory_council"),
+                    "email": cand.email,
+                    "source_type": cand.source_type,
+                    "source_name": cand.source_name,
+                    "source_url": cand.source_url,
+                    "confidence": cand.confidence,
                 },
             )
-            external_candidates = fetch_contacts_for_lead(
-                lead=row,
-                niche=niche,
-                country_code=country_code,
-                max_candidates=max(1, external_max),
-                timeout_seconds=max(2, external_timeout),
-            )
-            for cand in external_candidates:
-                logger.write(
-                    "lead_contact_candidate_found",
-                    {
-                        "run_id": run_id,
-                        "business_name": str(row.get("name", "") or "").strip(),
-                        "country_code": country_code,
-                        "email": cand.email,
-                        "source_type": cand.source_type,
-                        "source_name": cand.source_name,
-                        "source_url": cand.source_url,
-                        "confidence": cand.confidence,
-                    },
-                )
-            all_candidates.extend(external_candidates)
-
-        scored: list[tuple[float, ContactCandidate]] = []
-        freemail_domains = {
-            "gmail.com",
-            "hotmail.com",
-            "outlook.com",
-            "yahoo.com",
-            "icloud.com",
-            "live.com",
-            "aol.com",
-        }
-        seen: set[str] = set()
-        for cand in all_candidates:
-            em = (cand.email or "").strip().lower()
-            if not em or em in seen:
-                continue
-            seen.add(em)
-            vr = validate_email(em, store=store)
-            if vr.mx_cache_hit:
-                logger.write("email_mx_cache_hit", {"run_id": run_id, "email": em})
+        all_candidates.extend(external_candidates)
+
+    scored: list[tuple[float, ContactCandidate]] = []
+    freemail_domains = {
+        "gmail.com",
+        "hotmail.com",
+        "outlook.com",
+        "yahoo.com",
+        "icloud.com",
+        "live.com",
+        "aol.com",
+    }
+    seen: set[str] = set()
+    for cand in all_candidates:
+        em = (cand.email or "").strip().lower()
+        if not em or em in seen:
+            continue
+        seen.add(em)
+        vr = validate_email(em, store=store)
+        if vr.mx_cache_hit:
+            logger.write("email_mx_cache_hit", {"run_id": run_id, "email": em})
+        logger.write(
+            "email_mx_checked",
+            {
+                "run_id": run_id,
+                "email": em,
+                "validation_status": vr.validation_status,
+                "mx_ok": vr.mx_ok,
+                "cache_hit": vr.mx_cache_hit,
+            },
+        )
+        row.setdefault("contact_candidates", [])
+        cand_payload = asdict(cand)
+        cand_payload["validation_status"] = vr.validation_status
+        cand_payload["mx_ok"] = 1 if vr.mx_ok else 0
+        row["contact_candidates"].append(cand_payload)
+
+        if vr.validation_status != "valid":
             logger.write(
-                "email_mx_checked",
+                "lead_contact_candidate_rejected",
                 {
                     "run_id": run_id,
                     "email": em,
+                    "source_name": cand.source_name,
                     "validation_status": vr.validation_status,
-                    "mx_ok": vr.mx_ok,
-                    "cache_hit": vr.mx_cache_hit,
                 },
             )
-            row.setdefault("contact_candidates", [])
-            cand_payload = asdict(cand)
-            cand_payload["validation_status"] = vr.validation_status
-            cand_payload["mx_ok"] = 1 if vr.mx_ok else 0
-            row["contact_candidates"].append(cand_payload)
-
-            if vr.validation_status != "valid":
-                logger.write(
-                    "lead_contact_candidate_rejected",
-                    {
-                        "run_id": run_id,
-                        "email": em,
-                        "source_name": cand.source_name,
-                        "validation_status": vr.validation_status,
-                    },
-                )
-                continue
-            domain = em.split("@", 1)[-1]
-            source_base = {"council": 0.85, "directory": 0.65, "website": 0.50}.get(cand.source_type, 0.50)
-            score = source_base + (0.20 * float(cand.confidence)) + (0.10 if vr.mx_ok else 0.0)
-            if domain not in freemail_domains:
-                score += 0.05
-            if score < min_score:
-                logger.write(
-                    "lead_contact_candidate_rejected",
-                    {
-                        "run_id": run_id,
-                        "email": em,
-                        "source_name": cand.source_name,
-                        "validation_status": "low_score",
-                        "score": score,
-                        "min_score": min_score,
-                    },
-                )
-                continue
-            scored.append((score, cand))
-
-        scored.sort(key=lambda it: it[0], reverse=True)
-        selected_email = scored[0][1].email if scored else ""
-        selected_source = scored[0][1].source_name if scored else ""
-        if selected_email:
-            row["email"] = selected_email
-            ordered = [selected_email] + [it[1].email for it in scored[1:]]
-            row["website_emails"] = ", ".join(ordered[:10])
+            continue
+        domain = em.split("@", 1)[-1]
+        source_base = {"council": 0.85, "directory": 0.65, "website": 0.50}.get(cand.source_type, 0.50)
+        score = source_base + (0.20 * float(cand.confidence)) + (0.10 if vr.mx_ok else 0.0)
+        if domain not in freemail_domains:
+            score += 0.05
+        if score < min_score:
             logger.write(
-                "lead_contact_selected",
+                "lead_contact_candidate_rejected",
                 {
                     "run_id": run_id,
-                    "business_name": str(row.get("name", "") or "").strip(),
-                    "country_code": country_code,
-                    "email": selected_email,
-                    "source_name": selected_source,
-                    "score": scored[0][0],
+                    "email": em,
+                    "source_name": cand.source_name,
+                    "validation_status": "low_score",
+                    "score": score,
+                    "min_score": min_score,
                 },
             )
-        else:
-            row["email"] = ""
+            continue
+        scored.append((score, cand))
+
+    scored.sort(key=lambda it: it[0], reverse=True)
+    selected_email = scored[0][1].email if scored else ""
+    selected_source = scored[0][1].source_name if scored else ""
+    if selected_email:
+        row["email"] = selected_email
+        ordered = [selected_email] + [it[1].email for it in scored[1:]]
+        row["website_emails"] = ", ".join(ordered[:10])
+        logger.write(
+            "lead_contact_selected",
+            {
+                "run_id": run_id,
+                "business_name": str(row.get("name", "") or "").strip(),
+                "country_code": country_code,
+                "email": selected_email,
+                "source_name": selected_source,
+                "score": scored[0][0],
+            },
+        )
+    else:
+        row["email"] = ""
 
-        enriched.append(row)
-    return enriched
+    return row
 
 
 def _fetch_website_html(url: str) -> EnrichmentResult:
@@ -17,3 +17,13 @@ def export_xlsx(rows: list[dict], out_file: Path) -> Path:
     out_file.parent.mkdir(parents=True, exist_ok=True)
     df.to_excel(out_file, index=False)
     return out_file
+
+
+def export_csv_and_xlsx(rows: list[dict], csv_file: Path, xlsx_file: Path) -> list[Path]:
+    # One DataFrame feeds both sinks, so "both" builds and type-infers the frame once.
+    df = pd.DataFrame(rows)
+    for out_file in (csv_file, xlsx_file):
+        out_file.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(csv_file, index=False)
+    df.to_excel(xlsx_file, index=False)
+    return [csv_file, xlsx_file]
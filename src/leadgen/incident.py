@@ -5,12 +5,21 @@ import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import TypedDict
 
 from .config import IncidentPolicy
+from .sqlite_utils import ThreadLocalConnections
 from .time_utils import UTC
 
 
+class IncidentContext(TypedDict, total=False):
+    run_id: str
+    stage: str
+    audience: str
+    location: str
+    max_results: int
+
+
 @dataclass
 class IncidentState:
     fingerprint: str
@@ -25,10 +34,18 @@ class IncidentEngine:
         self.policy = policy
         self.incident_dir = incident_dir
         self.incident_dir.mkdir(parents=True, exist_ok=True)
+        self._conns = ThreadLocalConnections(self.db_path)
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        return self._conns.get()
+
+    def close(self) -> None:
+        """Close the SQLite connections opened by every thread; the store reconnects if used again."""
+        self._conns.close_all()
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events (
@@ -43,14 +60,18 @@ class IncidentEngine:
             conn.commit()
 
     @staticmethod
-    def fingerprint(error_type: str, message: str, stack: str, context: dict[str, Any]) -> str:
+    def fingerprint(error_type: str, message: str, stack: str, context: IncidentContext, run_id: str = "") -> str:
+        # Same sha256 over the {"run_id": ..., **context} repr as before run_id became an argument,
+        # so fingerprints (and the open incident windows keyed on them) survive upgrades.
+        if run_id:
+            context = {"run_id": run_id, **context}
         base = f"{error_type}|{message}|{stack}|{context}"
         return hashlib.sha256(base.encode("utf-8")).hexdigest()[:20]
 
     def register(self, fingerprint: str, error_type: str, message: str) -> IncidentState:
         now = datetime.now(UTC)
         window_start = now - timedelta(minutes=self.policy.window_min)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 "INSERT INTO events (fingerprint, timestamp_utc, error_type, message) VALUES (?, ?, ?, ?)",
                 (fingerprint, now.isoformat(), error_type, message),
@@ -86,7 +107,7 @@ class IncidentEngine:
         state: IncidentState,
         error_type: str,
         message: str,
-        context: dict[str, Any],
+        context: IncidentContext,
         attempts: list[str],
         impact: str,
         hypothesis: str,
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 from .time_utils import UTC
 
 SENSITIVE_KEYS = {
@@ -28,16 +30,71 @@ GENERIC_SECRET_RE = re.compile(r"(?i)(token|password|secret|api[_-]?key)\s*[:=]\
 @dataclass
 class JsonlLogger:
     file_path: Path
+    # Inside batch() lines are buffered and appended with one write per flush instead of one open/write per event.
+    batch_flush_every: int = 200
+    _buffer: list[str] | None = field(default=None, init=False, repr=False)
+    _batch_depth: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # Held across buffer swap + file append so concurrent flushes reach the file whole and in order;
+    # callers that only buffer take just _lock and never wait on file I/O.
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def write(self, event_type: str, payload: dict[str, Any]) -> None:
-        record = {
-            "timestamp_utc": datetime.now(UTC).isoformat(),
-            "event_type": event_type,
-            "payload": redact(payload),
-        }
+        self.write_many([(event_type, payload)])
+
+    def write_many(self, events: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        ts = datetime.now(UTC).isoformat()
+        lines = [
+            json.dumps({"timestamp_utc": ts, "event_type": event_type, "payload": redact(payload)}, ensure_ascii=True) + "\n"
+            for event_type, payload in events
+        ]
+        if not lines:
+            return
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.extend(lines)
+                if len(self._buffer) >= self.batch_flush_every:
+                    lines = []
+                else:
+                    return
+        if lines:
+            with self._write_lock:
+                self._append(lines)
+        else:
+            self._drain()
+
+    @contextmanager
+    def batch(self) -> Iterator[JsonlLogger]:
+        with self._lock:
+            self._batch_depth += 1
+            if self._buffer is None:
+                self._buffer = []
+        try:
+            yield self
+        finally:
+            self._drain(end_batch=True)
+
+    def flush(self) -> None:
+        # Persists what a batch has buffered so far; the batch itself stays open.
+        self._drain()
+
+    def _drain(self, end_batch: bool = False) -> None:
+        with self._write_lock:
+            lines: list[str] = []
+            with self._lock:
+                if end_batch:
+                    self._batch_depth -= 1
+                    if self._batch_depth == 0:
+                        lines, self._buffer = self._buffer or [], None
+                elif self._buffer:
+                    lines, self._buffer = self._buffer, []
+            if lines:
+                self._append(lines)
+
+    def _append(self, lines: list[str]) -> None:
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         with self.file_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, ensure_ascii=True) + "\n")
+            fh.write("".join(lines))
 
 
 def redact(value: Any) -> Any:
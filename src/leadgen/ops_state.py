@@ -4,10 +4,12 @@ import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+
+from .sqlite_utils import ThreadLocalConnections
 from .time_utils import UTC
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelMetrics:
     sent: int
     failed: int
@@ -31,10 +33,15 @@ class OperationalState:
     def __init__(self, db_path: Path) -> None:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conns = ThreadLocalConnections(self.db_path)
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        return self._conns.get()
+
+    def close(self) -> None:
+        """Close the SQLite connections opened by every thread; the store reconnects if used again."""
+        self._conns.close_all()
 
     def _init_db(self) -> None:
         with self._connect() as conn:
@@ -95,6 +102,11 @@ class OperationalState:
             )
             conn.commit()
 
+    def first_run_at(self) -> datetime | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT timestamp_utc FROM run_history ORDER BY id ASC LIMIT 1").fetchone()
+        return datetime.fromisoformat(str(row[0])) if row else None
+
     def unstable_streak(self, run_type: str) -> int:
         with self._connect() as conn:
             rows = conn.execute(
@@ -230,3 +242,23 @@ class OperationalState:
         if not row:
             return ChannelMetrics(sent=0, failed=0, bounces=0, complaints=0)
         return ChannelMetrics(sent=int(row[0]), failed=int(row[1]), bounces=int(row[2]), complaints=int(row[3]))
+
+    def get_all_channel_metrics(self, channels: list[str], day_utc: str | None = None) -> dict[str, ChannelMetrics]:
+        day = day_utc or datetime.now(UTC).strftime("%Y-%m-%d")
+        out = {channel: ChannelMetrics(sent=0, failed=0, bounces=0, complaints=0) for channel in channels}
+        if not channels:
+            return out
+        placeholders = ",".join("?" for _ in channels)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT channel, SUM(sent), SUM(failed), SUM(bounces), SUM(complaints)
+                FROM channel_metrics_daily
+                WHERE day_utc=? AND channel IN ({placeholders})
+                GROUP BY channel
+                """,
+                (day, *channels),
+            ).fetchall()
+        for channel, sent, failed, bounces, complaints in rows:
+            out[channel] = ChannelMetrics(sent=int(sent), failed=int(failed), bounces=int(bounces), complaints=int(complaints))
+        return out
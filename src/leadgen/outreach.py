@@ -2,11 +2,10 @@ from __future__ import annotations
 
 import json
 import os
-import random
 import re
-import time
 import uuid
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
@@ -103,10 +102,6 @@ def normalize_phone_br(raw: str) -> str:
     return ""
 
 
-def random_human_delay(min_seconds: float = 1.8, max_seconds: float = 4.2) -> None:
-    time.sleep(random.uniform(min_seconds, max_seconds))
-
-
 def build_unsubscribe_url(base_url: str, lead_id: int, channel: str) -> str:
     query = urlencode({"lead_id": lead_id, "channel": channel})
     return f"{base_url.rstrip('/')}/unsubscribe?{query}"
@@ -128,6 +123,7 @@ def _location_hint(value: str, locale: str) -> str:
     return city
 
 
+@lru_cache(maxsize=512)
 def _identity_service_label(service_hint: str, locale: str) -> str:
     raw = (service_hint or "").strip().lower()
     if any(tok in raw for tok in ["lawyer", "advogado", "abogado", "attorney", "solicitor"]):
@@ -221,6 +217,7 @@ def _identity_service_label(service_hint: str, locale: str) -> str:
     return "businesses like yours"
 
 
+@lru_cache(maxsize=512)
 def _service_category(service_hint: str) -> str:
     raw = (service_hint or "").strip().lower()
     if any(tok in raw for tok in ["lawyer", "advogado", "abogado", "attorney", "solicitor"]):
@@ -254,46 +251,87 @@ def _service_category(service_hint: str) -> str:
     return "general_service"
 
 
+# Pitch tables are built once at import; the per-lead path only does dict lookups.
+_PT_PITCH_A = {
+    "lawyer": "Focada para advocacia, com linguagem de confianca e CTA direto para consulta.",
+    "accountant": "Focada para contabilidade, com oferta clara de diagnostico e CTA para atendimento rapido.",
+    "dentist": "Focada para dentista, com destaque para procedimentos e CTA para agendamento.",
+    "physio": "Focada para fisioterapia, com destaque para tratamentos e CTA para avaliacao inicial.",
+    "psychologist": "Focada para psicologia, com abordagem acolhedora e CTA para primeira sessao.",
+    "architect": "Focada para arquitetura, com portfolio visual e CTA para briefing inicial.",
+    "financial_advisor": "Focada para consultoria financeira, com posicionamento premium e CTA para analise inicial.",
+    "insurance_broker": "Focada para corretor de seguros, com comparativo de opcoes e CTA para cotacao.",
+    "immigration_consultant": "Focada para consultoria de imigracao, com passos claros e CTA para avaliacao do caso.",
+    "business_consultant": "Focada para consultoria empresarial, com proposta de valor objetiva e CTA para reuniao.",
+    "electrician": "Focada em eletricista, com CTA direto para urgencia, instalacao e manutencao.",
+    "plumber": "Focada em encanador, com CTA direto para vazamento, desentupimento e reparo rapido.",
+    "locksmith": "Focada em chaveiro, com CTA direto para emergencia, abertura e troca de fechadura.",
+    "hvac": "Focada em climatizacao, com CTA direto para instalacao, limpeza e manutencao.",
+    "general_service": "Focada em servico local, com CTA direto para orcamento e atendimento rapido.",
+}
+
+_PT_PITCH_B = {
+    "lawyer": "Com estrutura para advocacia: prova social, areas atendidas e botao de contato imediato.",
+    "accountant": "Com estrutura para contabilidade: servicos principais, prova local e botao de contato imediato.",
+    "dentist": "Com estrutura para dentista: especialidades, prova local e botao de agendamento imediato.",
+    "physio": "Com estrutura para fisioterapia: tratamentos, prova local e botao de contato imediato.",
+    "psychologist": "Com estrutura para psicologia: especialidades, credenciais e botao de contato imediato.",
+    "architect": "Com estrutura para arquitetura: portfolio, processo e botao de contato imediato.",
+    "financial_advisor": "Com estrutura para consultoria financeira: autoridade, clareza e botao de contato imediato.",
+    "insurance_broker": "Com estrutura para corretor de seguros: coberturas, prova local e botao de cotacao imediata.",
+    "immigration_consultant": "Com estrutura para consultoria de imigracao: etapas, prova social e botao de contato imediato.",
+    "business_consultant": "Com estrutura para consultoria empresarial: diagnostico, casos e botao de contato imediato.",
+    "electrician": "Com estrutura para eletricista: prova local, servicos principais e botao de contato imediato.",
+    "plumber": "Com estrutura para encanador: prova local, servicos principais e botao de contato imediato.",
+    "locksmith": "Com estrutura para chaveiro: prova local, servicos principais e botao de contato imediato.",
+    "hvac": "Com estrutura para climatizacao: prova local, servicos principais e botao de contato imediato.",
+    "general_service": "Com estrutura para prestador de servico: prova local, servicos principais e botao de contato imediato.",
+}
+
+_EN_PITCH = {
+    "lawyer": "Built for law firms, with trust-first structure and a clear consultation CTA.",
+    "accountant": "Built for accountants, with service clarity and a direct CTA for first assessment.",
+    "dentist": "Built for dentists, with treatment highlights and booking-focused CTA.",
+    "physio": "Built for physiotherapists, with treatment positioning and first-session CTA.",
+    "psychologist": "Built for psychologists, with a trust-focused tone and first-contact CTA.",
+    "architect": "Built for architects, with portfolio-first layout and briefing CTA.",
+    "financial_advisor": "Built for financial advisors, with authority positioning and clear CTA.",
+    "insurance_broker": "Built for insurance brokers, with coverage clarity and quote CTA.",
+    "immigration_consultant": "Built for immigration consultants, with clear process steps and assessment CTA.",
+    "business_consultant": "Built for business consultants, with offer clarity and strategy-call CTA.",
+    "electrician": "Built for electricians, with urgency CTA and local proof.",
+    "plumber": "Built for plumbers, with emergency CTA and local proof.",
+    "locksmith": "Built for locksmiths, with emergency CTA and trust signals.",
+    "hvac": "Built for HVAC services, with maintenance CTA and local proof.",
+    "general_service": "Built for local services, with simple structure and fast-contact CTA.",
+}
+
+_ES_PITCH = {
+    "lawyer": "Pensada para despachos legales, con estructura de confianza y CTA de consulta.",
+    "accountant": "Pensada para contables, con servicios claros y CTA para primera evaluación.",
+    "dentist": "Pensada para clínicas dentales, con especialidades y CTA de cita.",
+    "physio": "Pensada para fisioterapia, con enfoque en tratamientos y CTA de primera evaluación.",
+    "psychologist": "Pensada para psicología, con tono de confianza y CTA de primer contacto.",
+    "architect": "Pensada para arquitectura, con portafolio visible y CTA de briefing.",
+    "financial_advisor": "Pensada para asesoría financiera, con posicionamiento profesional y CTA directo.",
+    "insurance_broker": "Pensada para seguros, con claridad de coberturas y CTA de cotización.",
+    "immigration_consultant": "Pensada para inmigración, con pasos claros y CTA de evaluación del caso.",
+    "business_consultant": "Pensada para consultoría de negocios, con propuesta clara y CTA de reunión.",
+    "electrician": "Pensada para electricistas, con CTA de urgencia y prueba local.",
+    "plumber": "Pensada para fontaneros, con CTA de urgencia y prueba local.",
+    "locksmith": "Pensada para cerrajeros, con CTA de urgencia y señales de confianza.",
+    "hvac": "Pensada para climatización, con CTA de mantenimiento y prueba local.",
+    "general_service": "Pensada para servicios locales, con estructura simple y CTA de contacto rápido.",
+}
+
+
 def _pt_service_pitch(category: str, ab_variant: str, has_website: bool) -> str:
     if has_website:
         if ab_variant == "B":
             return "E consigo melhorar bem o visual e os blocos de conversao do site atual para gerar mais pedidos."
         return "E consigo elevar bastante o visual e a clareza do site atual para transformar visitas em pedidos."
-    mapping_a = {
-        "lawyer": "Focada para advocacia, com linguagem de confianca e CTA direto para consulta.",
-        "accountant": "Focada para contabilidade, com oferta clara de diagnostico e CTA para atendimento rapido.",
-        "dentist": "Focada para dentista, com destaque para procedimentos e CTA para agendamento.",
-        "physio": "Focada para fisioterapia, com destaque para tratamentos e CTA para avaliacao inicial.",
-        "psychologist": "Focada para psicologia, com abordagem acolhedora e CTA para primeira sessao.",
-        "architect": "Focada para arquitetura, com portfolio visual e CTA para briefing inicial.",
-        "financial_advisor": "Focada para consultoria financeira, com posicionamento premium e CTA para analise inicial.",
-        "insurance_broker": "Focada para corretor de seguros, com comparativo de opcoes e CTA para cotacao.",
-        "immigration_consultant": "Focada para consultoria de imigracao, com passos claros e CTA para avaliacao do caso.",
-        "business_consultant": "Focada para consultoria empresarial, com proposta de valor objetiva e CTA para reuniao.",
-        "electrician": "Focada em eletricista, com CTA direto para urgencia, instalacao e manutencao.",
-        "plumber": "Focada em encanador, com CTA direto para vazamento, desentupimento e reparo rapido.",
-        "locksmith": "Focada em chaveiro, com CTA direto para emergencia, abertura e troca de fechadura.",
-        "hvac": "Focada em climatizacao, com CTA direto para instalacao, limpeza e manutencao.",
-        "general_service": "Focada em servico local, com CTA direto para orcamento e atendimento rapido.",
-    }
-    mapping_b = {
-        "lawyer": "Com estrutura para advocacia: prova social, areas atendidas e botao de contato imediato.",
-        "accountant": "Com estrutura para contabilidade: servicos principais, prova local e botao de contato imediato.",
-        "dentist": "Com estrutura para dentista: especialidades, prova local e botao de agendamento imediato.",
-        "physio": "Com estrutura para fisioterapia: tratamentos, prova local e botao de contato imediato.",
-        "psychologist": "Com estrutura para psicologia: especialidades, credenciais e botao de contato imediato.",
-        "architect": "Com estrutura para arquitetura: portfolio, processo e botao de contato imediato.",
-        "financial_advisor": "Com estrutura para consultoria financeira: autoridade, clareza e botao de contato imediato.",
-        "insurance_broker": "Com estrutura para corretor de seguros: coberturas, prova local e botao de cotacao imediata.",
-        "immigration_consultant": "Com estrutura para consultoria de imigracao: etapas, prova social e botao de contato imediato.",
-        "business_consultant": "Com estrutura para consultoria empresarial: diagnostico, casos e botao de contato imediato.",
-        "electrician": "Com estrutura para eletricista: prova local, servicos principais e botao de contato imediato.",
-        "plumber": "Com estrutura para encanador: prova local, servicos principais e botao de contato imediato.",
-        "locksmith": "Com estrutura para chaveiro: prova local, servicos principais e botao de contato imediato.",
-        "hvac": "Com estrutura para climatizacao: prova local, servicos principais e botao de contato imediato.",
-        "general_service": "Com estrutura para prestador de servico: prova local, servicos principais e botao de contato imediato.",
-    }
-    return mapping_b.get(category, mapping_b["general_service"]) if ab_variant == "B" else mapping_a.get(category, mapping_a["general_service"])
+    mapping = _PT_PITCH_B if ab_variant == "B" else _PT_PITCH_A
+    return mapping.get(category, mapping["general_service"])
 
 
 def _money(amount: int, currency_code: str, locale: str) -> str:
@@ -308,47 +346,13 @@ def _money(amount: int, currency_code: str, locale: str) -> str:
 def _en_service_pitch(category: str, has_website: bool) -> str:
     if has_website:
         return "I can redesign your current site into a stronger conversion page with clearer messaging and better CTA flow."
-    mapping = {
-        "lawyer": "Built for law firms, with trust-first structure and a clear consultation CTA.",
-        "accountant": "Built for accountants, with service clarity and a direct CTA for first assessment.",
-        "dentist": "Built for dentists, with treatment highlights and booking-focused CTA.",
-        "physio": "Built for physiotherapists, with treatment positioning and first-session CTA.",
-        "psychologist": "Built for psychologists, with a trust-focused tone and first-contact CTA.",
-        "architect": "Built for architects, with portfolio-first layout and briefing CTA.",
-        "financial_advisor": "Built for financial advisors, with authority positioning and clear CTA.",
-        "insurance_broker": "Built for insurance brokers, with coverage clarity and quote CTA.",
-        "immigration_consultant": "Built for immigration consultants, with clear process steps and assessment CTA.",
-        "business_consultant": "Built for business consultants, with offer clarity and strategy-call CTA.",
-        "electrician": "Built for electricians, with urgency CTA and local proof.",
-        "plumber": "Built for plumbers, with emergency CTA and local proof.",
-        "locksmith": "Built for locksmiths, with emergency CTA and trust signals.",
-        "hvac": "Built for HVAC services, with maintenance CTA and local proof.",
-        "general_service": "Built for local services, with simple structure and fast-contact CTA.",
-    }
-    return mapping.get(category, mapping["general_service"])
+    return _EN_PITCH.get(category, _EN_PITCH["general_service"])
 
 
 def _es_service_pitch(category: str, has_website: bool) -> str:
     if has_website:
         return "Puedo rediseñar su web actual para que convierta mejor, con mensaje más claro y CTA más fuerte."
-    mapping = {
-        "lawyer": "Pensada para despachos legales, con estructura de confianza y CTA de consulta.",
-        "accountant": "Pensada para contables, con servicios claros y CTA para primera evaluación.",
-        "dentist": "Pensada para clínicas dentales, con especialidades y CTA de cita.",
-        "physio": "Pensada para fisioterapia, con enfoque en tratamientos y CTA de primera evaluación.",
-        "psychologist": "Pensada para psicología, con tono de confianza y CTA de primer contacto.",
-        "architect": "Pensada para arquitectura, con portafolio visible y CTA de briefing.",
-        "financial_advisor": "Pensada para asesoría financiera, con posicionamiento profesional y CTA directo.",
-        "insurance_broker": "Pensada para seguros, con claridad de coberturas y CTA de cotización.",
-        "immigration_consultant": "Pensada para inmigración, con pasos claros y CTA de evaluación del caso.",
-        "business_consultant": "Pensada para consultoría de negocios, con propuesta clara y CTA de reunión.",
-        "electrician": "Pensada para electricistas, con CTA de urgencia y prueba local.",
-        "plumber": "Pensada para fontaneros, con CTA de urgencia y prueba local.",
-        "locksmith": "Pensada para cerrajeros, con CTA de urgencia y señales de confianza.",
-        "hvac": "Pensada para climatización, con CTA de mantenimiento y prueba local.",
-        "general_service": "Pensada para servicios locales, con estructura simple y CTA de contacto rápido.",
-    }
-    return mapping.get(category, mapping["general_service"])
+    return _ES_PITCH.get(category, _ES_PITCH["general_service"])
 
 
 def initial_consent_email(
@@ -836,9 +840,12 @@ def is_positive_reply(text: str) -> bool:
     return any(p in t for p in positives)
 
 
+# The whole (trimmed, lower-cased) reply must be one of these; a frozenset makes it one hash lookup.
+_OPT_OUT_REPLIES = frozenset({"parar", "sair", "stop", "unsubscribe", "cancelar", "remove"})
+
+
 def is_opt_out_reply(text: str) -> bool:
-    t = (text or "").strip().lower()
-    return t in {"parar", "sair", "stop", "unsubscribe", "cancelar", "remove"}
+    return (text or "").strip().lower() in _OPT_OUT_REPLIES
 
 
 def classify_reply(text: str) -> tuple[str, float]:
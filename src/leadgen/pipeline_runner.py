@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterator
 
 from .anti_ban import (
     AntiBanThresholds,
@@ -18,9 +22,9 @@ from .crm_store import CrmStore
 from .demo_site import DemoSiteBuilder, slugify
 from .email_validation import is_valid_email_candidate, normalize_email
 from .enrichment import enrich_with_website_contacts
-from .incident import IncidentEngine
+from .incident import IncidentContext, IncidentEngine
 from .logging_utils import JsonlLogger
-from .ops_state import OperationalState
+from .ops_state import ChannelMetrics, OperationalState
 from .payment import get_stripe_client_from_env
 from .outreach import (
     detect_plan_choice,
@@ -30,21 +34,24 @@ from .outreach import (
     identity_probe_email,
     initial_consent_email,
     initial_consent_whatsapp,
-    is_opt_out_reply,
     normalize_phone_br,
     offer_email,
     offer_followup_email,
     offer_whatsapp,
     followup_consent_email,
     followup_consent_whatsapp,
-    random_human_delay,
     build_unsubscribe_url,
+    DeliveryResult,
 )
-from .scraper import GoogleMapsScraper, ScrapePausedError, ScrapeRequest
+from .scraper import GoogleMapsScraper, ScrapePausedError, ScrapeRequest, ScrapeRuntime
+from .throttle import SendThrottle
 from .time_utils import UTC
 
+_NON_DIGITS_RE = re.compile(r"\D+")
+_BR_UF_RE = re.compile(r"\b(sp|rj|mg|ba|ce|pr|rs|sc|go|df)\b")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PipelineSummary:
     run_id: str
     leads_ingested: int
@@ -53,15 +60,55 @@ class PipelineSummary:
     offers_sent: int
 
 
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineEnv:
+    preview_base: str
+    preview_dir: Path | None
+    unsubscribe_base: str
+    payment_success_url: str
+    payment_cancel_url: str
+    wa_daily_limit: int
+    allow_relaxed_icp: bool
+    email_only: bool
+    close_days: int
+    reply_confidence_min: float
+    # Dev/CI/backtests only; production always keeps human-paced sends enabled.
+    human_delay_enabled: bool
+
+
+@lru_cache(maxsize=1)
+def _pipeline_env() -> PipelineEnv:
+    # Read once per process; call _pipeline_env.cache_clear() after changing the environment.
+    preview_base = os.getenv("PREVIEW_BASE_URL", "http://localhost:8080")
+    preview_dir = os.getenv("PREVIEW_PUBLISH_DIR", "")
+    return PipelineEnv(
+        preview_base=preview_base,
+        preview_dir=Path(preview_dir) if preview_dir else None,
+        unsubscribe_base=os.getenv("UNSUBSCRIBE_BASE_URL", preview_base),
+        payment_success_url=os.getenv("STRIPE_SUCCESS_URL", f"{preview_base}/payment/success?session_id={{CHECKOUT_SESSION_ID}}"),
+        payment_cancel_url=os.getenv("STRIPE_CANCEL_URL", f"{preview_base}/payment/cancel"),
+        wa_daily_limit=int(os.getenv("LEADGEN_WA_DAILY_LIMIT", "40")),
+        allow_relaxed_icp=_env_flag("LEADGEN_ALLOW_RELAXED_ICP", "1"),
+        email_only=_env_flag("LEADGEN_EMAIL_ONLY", "0"),
+        close_days=int(os.getenv("LEADGEN_CLOSE_DAYS", "7")),
+        reply_confidence_min=float(os.getenv("LEADGEN_REPLY_CONFIDENCE_MIN", "0.65")),
+        human_delay_enabled=not _env_flag("LEADGEN_DISABLE_HUMAN_DELAY", "0"),
+    )
+
+
 class LeadPipelineRunner:
-    def __init__(self) -> None:
+    def __init__(self, logger: JsonlLogger | None = None, incident_engine: IncidentEngine | None = None) -> None:
         self.cfg = get_config()
-        self.logger = JsonlLogger(self.cfg.log_dir / "events.jsonl")
-        self.scraper = GoogleMapsScraper()
+        self.logger = logger or JsonlLogger(self.cfg.log_dir / "events.jsonl")
+        self.scraper = GoogleMapsScraper(on_long_pause=self.logger.flush)
         self.store = CrmStore(self.cfg.state_db)
         self.ops = OperationalState(self.cfg.ops_state_db)
         self.stripe_client = get_stripe_client_from_env()
-        self.incident_engine = IncidentEngine(
+        self.incident_engine = incident_engine or IncidentEngine(
             db_path=self.cfg.log_dir / "incident_state.db",
             policy=self.cfg.incident,
             incident_dir=self.cfg.log_dir / "incidents",
@@ -69,20 +116,44 @@ class LeadPipelineRunner:
         self.thresholds = AntiBanThresholds()
         self.email_client = get_resend_client_from_env()
         self.wa_client = get_wpp_client_from_env()
-        preview_base = os.getenv("PREVIEW_BASE_URL", "http://localhost:8080")
-        preview_dir = Path(os.getenv("PREVIEW_PUBLISH_DIR", str(self.cfg.preview_dir)))
-        self.demo_builder = DemoSiteBuilder(base_url=preview_base, publish_dir=preview_dir)
-        self.unsubscribe_base = os.getenv("UNSUBSCRIBE_BASE_URL", preview_base)
-        self.payment_success_url = os.getenv("STRIPE_SUCCESS_URL", f"{preview_base}/payment/success?session_id={{CHECKOUT_SESSION_ID}}")
-        self.payment_cancel_url = os.getenv("STRIPE_CANCEL_URL", f"{preview_base}/payment/cancel")
-        self.wa_daily_limit = int(os.getenv("LEADGEN_WA_DAILY_LIMIT", "40"))
-        self.allow_relaxed_icp = os.getenv("LEADGEN_ALLOW_RELAXED_ICP", "1").strip().lower() in {"1", "true", "yes", "on"}
-        self.email_only = os.getenv("LEADGEN_EMAIL_ONLY", "0").strip().lower() in {"1", "true", "yes", "on"}
-        self.close_days = int(os.getenv("LEADGEN_CLOSE_DAYS", "7"))
-        self.reply_confidence_min = float(os.getenv("LEADGEN_REPLY_CONFIDENCE_MIN", "0.65"))
+        env = _pipeline_env()
+        self.env = env
+        self.throttle = SendThrottle(pace=env.human_delay_enabled)
+        self.demo_builder = DemoSiteBuilder(base_url=env.preview_base, publish_dir=env.preview_dir or self.cfg.preview_dir)
+        self.unsubscribe_base = env.unsubscribe_base
+        self.payment_success_url = env.payment_success_url
+        self.payment_cancel_url = env.payment_cancel_url
+        self.wa_daily_limit = env.wa_daily_limit
+        self.allow_relaxed_icp = env.allow_relaxed_icp
+        self.email_only = env.email_only
+        self.close_days = env.close_days
+        self.reply_confidence_min = env.reply_confidence_min
+        self.enrich_workers = self.cfg.enrich_workers
+        # Long-lived so its two threads (and their per-thread SQLite connections) are reused across
+        # send_followups() calls instead of piling up in a campaign window; shut down in close().
+        self._followup_pool: ThreadPoolExecutor | None = None
+        self._campaign_start: datetime | None = None
         if self.email_only:
             self.wa_client = None
 
+    def __enter__(self) -> LeadPipelineRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Browser and follow-up workers first, then the per-thread SQLite connections of every store this runner opened.
+        try:
+            self.scraper.close()
+            pool, self._followup_pool = self._followup_pool, None
+            if pool is not None:
+                pool.shutdown(wait=True)
+        finally:
+            self.store.close()
+            self.ops.close()
+            self.incident_engine.close()
+
     def run_all(
         self,
         audience: str,
@@ -138,41 +209,49 @@ class LeadPipelineRunner:
             return 0
 
         try:
-            result = self.scraper.scrape(
-                ScrapeRequest(
-                    audience=audience,
-                    location=location,
-                    max_results=max_results,
-                    headless=headless,
-                )
+            req = ScrapeRequest(
+                audience=audience,
+                location=location,
+                max_results=max_results,
+                headless=headless,
+                parallel_pages=self.cfg.scrape_pages,
             )
-            rows = result.rows
+            runtime = ScrapeRuntime()
             country_code = self._country_code_for_location(location)
-            for row in rows:
-                row["country_code"] = country_code
-                row["audience"] = audience
+            rows_stream = self._tag_rows(self.scraper.stream_scrape(req, runtime), country_code, audience)
             if enrich_website:
-                rows = enrich_with_website_contacts(rows, self.logger, run_id, store=self.store)
+                rows = enrich_with_website_contacts(
+                    rows_stream, self.logger, run_id, store=self.store, max_workers=self.enrich_workers
+                )
+            else:
+                rows = list(rows_stream)
+            result = self.scraper.build_result(rows, req, runtime)
+            rows = result.rows
 
             # International mode: keep all contactable businesses, including those with existing websites.
-            rows_qualified = [
-                row
-                for row in rows
-                if str(row.get("phone", "")).strip() or str(row.get("website_emails", "")).strip()
-            ]
+            # Scraper and enrichment already hand over stripped strings, so a single pass tags each row.
+            rows_qualified: list[tuple[dict, str]] = []
+            strict_candidates = 0
+            for row in rows:
+                has_emails = bool(row.get("website_emails"))
+                if not has_emails and not row.get("phone"):
+                    continue
+                if not row.get("website"):
+                    strict_candidates += 1
+                rows_qualified.append((row, "EMAIL" if has_emails else "WHATSAPP"))
             relaxed = True
             self.logger.write(
                 "icp_relaxed_mode_enabled",
                 {
                     "run_id": run_id,
                     "reason": "contactable_businesses_only",
-                    "strict_candidates": 0,
+                    "strict_candidates": strict_candidates,
                     "relaxed_candidates": len(rows_qualified),
                 },
             )
 
             leads_before = self.store.count_leads()
-            for row in rows_qualified:
+            for row, channel_selected in rows_qualified:
                 lead_id = self.store.upsert_lead_from_row(
                     run_id,
                     row,
@@ -196,7 +275,7 @@ class LeadPipelineRunner:
                         "lead_id": lead_id,
                         "business_name": row.get("name", ""),
                         "qualified_mode": "RELAXED" if relaxed else "STRICT",
-                        "channel_selected": "EMAIL" if str(row.get("website_emails", "")).strip() else "WHATSAPP",
+                        "channel_selected": channel_selected,
                     },
                 )
             leads_after = self.store.count_leads()
@@ -266,13 +345,13 @@ class LeadPipelineRunner:
             return 0
 
         scope = self._outreach_scope_from_run_id(run_id)
-        leads = self.store.list_leads_for_identity_probe(limit=250, run_id_prefix=scope)
         count = 0
         day_index = self._campaign_day_index()
         email_limit = email_warmup_daily_limit(day_index)
         email_metrics = self.ops.get_channel_metrics("EMAIL")
+        opt_outs = self.store.load_opt_out_set()
 
-        for lead in leads:
+        for lead in self.store.iter_leads_for_identity_probe(limit=250, run_id_prefix=scope):
             if count >= 250:
                 break
             if self.ops.is_channel_paused("EMAIL"):
@@ -288,7 +367,7 @@ class LeadPipelineRunner:
                     },
                 )
                 break
-            if self.store.is_opted_out(lead.email, "EMAIL"):
+            if self.store.opt_out_key(lead.email, "EMAIL") in opt_outs:
                 continue
             email_contact = normalize_email(lead.email or "")
             if not self._is_likely_real_email(email_contact):
@@ -321,14 +400,15 @@ class LeadPipelineRunner:
                 city=lead.address,
                 locale=locale,
             )
-            sent = self.email_client.send(email_contact, subject, html)
-            self.store.save_touch(lead.id, "EMAIL", "IDENTITY_CHECK", "email_identity_v1", sent.status, sent.message_id, body_text)
-            self.ops.add_channel_metrics("EMAIL", sent=1, failed=0 if sent.ok else 1)
+            sent = self._throttled_send(run_id, "EMAIL", self.email_client.send, email_contact, subject, html)
+            with self.store.transaction():
+                self._record_send(lead.id, "EMAIL", "IDENTITY_CHECK", "email_identity_v1", sent, body_text)
+                if sent.ok:
+                    self.store.update_stage(lead.id, "VERIFY_WAITING")
+                    self.store.mark_contact_sent(email_contact, "EMAIL", "IDENTITY_CHECK", lead.id)
             email_metrics = self.ops.get_channel_metrics("EMAIL")
             count += 1
             if sent.ok:
-                self.store.update_stage(lead.id, "VERIFY_WAITING")
-                self.store.mark_contact_sent(email_contact, "EMAIL", "IDENTITY_CHECK", lead.id)
                 self.logger.write(
                     "contact_delivered",
                     {"run_id": run_id, "lead_id": lead.id, "channel": "EMAIL", "intent": "IDENTITY_CHECK", "daily_sent": email_metrics.sent},
@@ -336,8 +416,7 @@ class LeadPipelineRunner:
             else:
                 self.logger.write("contact_failed", {"run_id": run_id, "lead_id": lead.id, "channel": "EMAIL", "detail": sent.detail, "intent": "IDENTITY_CHECK"})
 
-            random_human_delay()
-            self._evaluate_email_health(run_id)
+            self._evaluate_email_health(run_id, email_metrics)
 
         self._evaluate_global_safe_mode(run_id)
         return count
@@ -345,11 +424,27 @@ class LeadPipelineRunner:
     def send_followups(self, run_id: str) -> int:
         if self.ops.global_safe_mode_enabled():
             return 0
-        count = 0
+        now_epoch = int(datetime.now(UTC).timestamp())
+
+        # Consent and offer follow-ups touch disjoint stages; run them side by side, sharing the
+        # per-channel throttle (and so the email rate). Both send through the same email client: the
+        # Resend/WPP clients hold only immutable config and open a fresh urlopen request per send.
+        if self._followup_pool is None:
+            self._followup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="followup")
+        consent = self._followup_pool.submit(self._run_consent_followups, run_id, now_epoch)
+        offers = self._followup_pool.submit(self._run_offer_followups, run_id, now_epoch)
+        count = consent.result() + offers.result()
 
+        closed_lost = self.close_stale_sequences(run_id)
+        if count or closed_lost:
+            self.logger.write("followup_batch_sent", {"run_id": run_id, "count": count, "closed_lost": closed_lost})
+        self._evaluate_channel_health(run_id)
+        return count
+
+    def _run_consent_followups(self, run_id: str, now_epoch: int) -> int:
         # Consent follow-ups: D+2 and D+4.
-        leads = self.store.list_leads_waiting_reply(limit=300)
-        for lead in leads:
+        count = 0
+        for lead in self.store.iter_leads_waiting_reply(limit=300):
             if self.email_only and lead.channel_preferred == "WHATSAPP":
                 self.logger.write(
                     "followup_skipped",
@@ -358,10 +453,10 @@ class LeadPipelineRunner:
                 continue
 
             step = self.store.count_touches(lead.id, intent="CONSENT_REQUEST")
-            first_touch = self.store.get_first_touch_timestamp(lead.id, intent="CONSENT_REQUEST")
+            first_touch = self.store.get_first_touch_epoch(lead.id, intent="CONSENT_REQUEST")
             if not first_touch:
                 continue
-            days_since = max(0, (datetime.now(UTC) - datetime.fromisoformat(first_touch)).days)
+            days_since = max(0, (now_epoch - first_touch) // 86400)
             if (step == 1 and days_since < 2) or (step == 2 and days_since < 4):
                 continue
             if step < 1 or step >= 3:
@@ -376,11 +471,9 @@ class LeadPipelineRunner:
                     has_website=bool((lead.website or "").strip()),
                     locale=self._lead_locale(lead.phone, lead.address),
                 )
-                sent = self.email_client.send(lead.email, subject, html)
-                self.store.save_touch(lead.id, "EMAIL", "CONSENT_REQUEST", f"email_followup_{step}", sent.status, sent.message_id, body_text)
-                self.ops.add_channel_metrics("EMAIL", sent=1, failed=0 if sent.ok else 1)
+                sent = self._throttled_send(run_id, "EMAIL", self.email_client.send, lead.email, subject, html)
+                self._record_send(lead.id, "EMAIL", "CONSENT_REQUEST", f"email_followup_{step}", sent, body_text)
                 count += 1
-                random_human_delay()
                 continue
 
             if lead.channel_preferred == "WHATSAPP" and lead.phone and self.wa_client and not self.ops.is_channel_paused("WHATSAPP"):
@@ -393,24 +486,24 @@ class LeadPipelineRunner:
                     has_website=bool((lead.website or "").strip()),
                     locale=self._lead_locale(lead.phone, lead.address),
                 )
-                sent = self.wa_client.send(normalized, body)
-                self.store.save_touch(lead.id, "WHATSAPP", "CONSENT_REQUEST", f"wa_followup_{step}", sent.status, sent.message_id, body)
-                self.ops.add_channel_metrics("WHATSAPP", sent=1, failed=0 if sent.ok else 1)
+                sent = self._throttled_send(run_id, "WHATSAPP", self.wa_client.send, normalized, body)
+                self._record_send(lead.id, "WHATSAPP", "CONSENT_REQUEST", f"wa_followup_{step}", sent, body)
                 count += 1
-                random_human_delay()
+        return count
 
+    def _run_offer_followups(self, run_id: str, now_epoch: int) -> int:
         # Offer follow-ups: D+1 and D+3.
-        offered = self.store.list_leads_by_stage("PAYMENT_SENT", limit=300)
-        for lead in offered:
+        count = 0
+        for lead in self.store.iter_leads_by_stage("PAYMENT_SENT", limit=300):
             if lead.channel_preferred != "EMAIL" or not lead.email or not self.email_client:
                 continue
             if self.ops.is_channel_paused("EMAIL"):
                 continue
             offer_step = self.store.count_touches(lead.id, intent="OFFER")
-            first_offer = self.store.get_first_touch_timestamp(lead.id, intent="OFFER")
+            first_offer = self.store.get_first_touch_epoch(lead.id, intent="OFFER")
             if not first_offer:
                 continue
-            days_since_offer = max(0, (datetime.now(UTC) - datetime.fromisoformat(first_offer)).days)
+            days_since_offer = max(0, (now_epoch - first_offer) // 86400)
             next_step = 0
             if offer_step == 1 and days_since_offer >= 1:
                 next_step = 1
@@ -426,18 +519,9 @@ class LeadPipelineRunner:
                 has_website=bool((lead.website or "").strip()),
                 locale=self._lead_locale(lead.phone, lead.address),
             )
-            sent = self.email_client.send(lead.email, subject, html)
-            self.store.save_touch(lead.id, "EMAIL", "OFFER", f"email_offer_followup_{next_step}", sent.status, sent.message_id, body_text)
-            self.ops.add_channel_metrics("EMAIL", sent=1, failed=0 if sent.ok else 1)
+            sent = self._throttled_send(run_id, "EMAIL", self.email_client.send, lead.email, subject, html)
+            self._record_send(lead.id, "EMAIL", "OFFER", f"email_offer_followup_{next_step}", sent, body_text)
             count += 1
-            random_human_delay()
-
-        closed_lost = self.close_stale_sequences(run_id)
-        if count or closed_lost:
-            self.logger.write("followup_batch_sent", {"run_id": run_id, "count": count, "closed_lost": closed_lost})
-        self._evaluate_email_health(run_id)
-        self._evaluate_whatsapp_health(run_id)
-        self._evaluate_global_safe_mode(run_id)
         return count
 
     def process_reply(self, run_id: str, lead_id: int, channel: str, text: str) -> None:
@@ -453,7 +537,8 @@ class LeadPipelineRunner:
                 "confidence": confidence,
             },
         )
-        if classification == "opt_out" or is_opt_out_reply(text):
+        # classify_reply already runs the opt-out check first, so its label is authoritative here.
+        if classification == "opt_out":
             email, phone = self.store.get_contact(lead_id)
             contact = email if channel == "EMAIL" else phone
             if contact:
@@ -488,22 +573,42 @@ class LeadPipelineRunner:
             self.logger.write("safe_mode_enabled", {"run_id": run_id, "reason": "global_safe_mode_blocks_offer"})
             return 0
 
-        leads = self.store.list_leads_for_offer(limit=200)
         sent_count = 0
         wa_metrics = self.ops.get_channel_metrics("WHATSAPP")
-        for lead in leads:
+        for lead in self.store.iter_leads_for_offer(limit=200):
             if self.email_only and lead.channel_preferred == "WHATSAPP":
                 self.logger.write(
                     "offer_skipped",
                     {"run_id": run_id, "lead_id": lead.id, "channel": "WHATSAPP", "reason": "email_only_mode"},
                 )
                 continue
+            # Check the channel before the demo build: publishing moves the lead out of CONSENTED, so an
+            # unsendable lead would be stranded with a rendered demo and no offer.
+            if lead.channel_preferred == "EMAIL":
+                usable = bool(lead.email and self.email_client) and not self.ops.is_channel_paused("EMAIL")
+            elif lead.channel_preferred == "WHATSAPP":
+                usable = bool(lead.phone and self.wa_client) and not self.ops.is_channel_paused("WHATSAPP")
+            else:
+                usable = False
+            if not usable:
+                continue
+            if lead.channel_preferred == "WHATSAPP" and wa_metrics.sent >= self.wa_daily_limit:
+                self.logger.write(
+                    "deliverability_alert",
+                    {
+                        "run_id": run_id,
+                        "channel": "WHATSAPP",
+                        "daily_sent": wa_metrics.sent,
+                        "daily_limit": self.wa_daily_limit,
+                    },
+                )
+                break
             slug = f"{slugify(lead.business_name)}-{lead.id}"
             demo = self.demo_builder.build_for_lead(slug, lead.business_name, "prestador de servico", lead.address)
             self.store.set_preview_and_payment(lead.id, demo.preview_url, payment_url)
             self.logger.write("demo_published", {"run_id": run_id, "lead_id": lead.id, "preview_url": demo.preview_url, "file_path": str(demo.file_path)})
 
-            if lead.channel_preferred == "EMAIL" and lead.email and self.email_client and not self.ops.is_channel_paused("EMAIL"):
+            if lead.channel_preferred == "EMAIL":
                 pricing = self.store.get_pricing_state()
                 locale = self._lead_locale(lead.phone, lead.address)
                 regional_full, regional_simple, regional_currency = self._regional_prices(locale, pricing)
@@ -550,12 +655,13 @@ class LeadPipelineRunner:
                     payment_url_full=payment_url_full,
                     payment_url_simple=payment_url_simple,
                 )
-                result = self.email_client.send(lead.email, subject, html)
-                self.store.save_touch(lead.id, "EMAIL", "OFFER", "email_offer_v1", result.status, result.message_id, body_text)
-                self.ops.add_channel_metrics("EMAIL", sent=1, failed=0 if result.ok else 1)
+                result = self._throttled_send(run_id, "EMAIL", self.email_client.send, lead.email, subject, html)
+                with self.store.transaction():
+                    self._record_send(lead.id, "EMAIL", "OFFER", "email_offer_v1", result, body_text)
+                    if result.ok:
+                        pricing_eval = self.store.record_offer_snapshot(lead.id, run_id=run_id)
+                        self.store.update_stage(lead.id, "PAYMENT_SENT")
                 if result.ok:
-                    pricing_eval = self.store.record_offer_snapshot(lead.id, run_id=run_id)
-                    self.store.update_stage(lead.id, "PAYMENT_SENT")
                     self.logger.write(
                         "offer_sent",
                         {
@@ -585,18 +691,7 @@ class LeadPipelineRunner:
                 else:
                     self.logger.write("contact_failed", {"run_id": run_id, "lead_id": lead.id, "channel": "EMAIL", "detail": result.detail})
 
-            elif lead.channel_preferred == "WHATSAPP" and lead.phone and self.wa_client and not self.ops.is_channel_paused("WHATSAPP"):
-                if wa_metrics.sent >= self.wa_daily_limit:
-                    self.logger.write(
-                        "deliverability_alert",
-                        {
-                            "run_id": run_id,
-                            "channel": "WHATSAPP",
-                            "daily_sent": wa_metrics.sent,
-                            "daily_limit": self.wa_daily_limit,
-                        },
-                    )
-                    break
+            else:
                 phone = normalize_phone_br(lead.phone)
                 if phone:
                     pricing = self.store.get_pricing_state()
@@ -612,21 +707,19 @@ class LeadPipelineRunner:
                         locale=locale,
                         currency_code=regional_currency,
                     )
-                    result = self.wa_client.send(phone, body)
-                    self.store.save_touch(lead.id, "WHATSAPP", "OFFER", "wa_offer_v1", result.status, result.message_id, body)
-                    self.ops.add_channel_metrics("WHATSAPP", sent=1, failed=0 if result.ok else 1)
+                    result = self._throttled_send(run_id, "WHATSAPP", self.wa_client.send, phone, body)
+                    with self.store.transaction():
+                        self._record_send(lead.id, "WHATSAPP", "OFFER", "wa_offer_v1", result, body)
+                        if result.ok:
+                            self.store.update_stage(lead.id, "PAYMENT_SENT")
                     wa_metrics = self.ops.get_channel_metrics("WHATSAPP")
                     if result.ok:
-                        self.store.update_stage(lead.id, "PAYMENT_SENT")
                         self.logger.write("offer_sent", {"run_id": run_id, "lead_id": lead.id, "channel": "WHATSAPP", "preview_url": demo.preview_url})
                         sent_count += 1
                     else:
                         self.logger.write("contact_failed", {"run_id": run_id, "lead_id": lead.id, "channel": "WHATSAPP", "detail": result.detail})
-            random_human_delay()
 
-        self._evaluate_email_health(run_id)
-        self._evaluate_whatsapp_health(run_id)
-        self._evaluate_global_safe_mode(run_id)
+        self._evaluate_channel_health(run_id)
         return sent_count
 
     def mark_sale(self, run_id: str, lead_id: int, accepted_plan: str, reason: str) -> dict:
@@ -659,17 +752,17 @@ class LeadPipelineRunner:
 
     def close_stale_sequences(self, run_id: str) -> int:
         lost_ids = self.store.close_expired_sequences(max_days=self.close_days)
-        for lead_id in lost_ids:
-            self.logger.write(
-                "lead_closed_lost",
-                {"run_id": run_id, "lead_id": lead_id, "reason": f"no_close_within_{self.close_days}d"},
-            )
+        reason = f"no_close_within_{self.close_days}d"
+        self.logger.write_many(
+            ("lead_closed_lost", {"run_id": run_id, "lead_id": lead_id, "reason": reason}) for lead_id in lost_ids
+        )
         return len(lost_ids)
 
     def _emit_domain_expiry_alerts(self, run_id: str) -> None:
         alerts = self.store.list_domain_alert_candidates([30, 15, 7])
-        for alert in alerts:
-            self.logger.write(
+        # Log first, then mark: a crash in between re-sends an alert rather than silently dropping it.
+        self.logger.write_many(
+            (
                 "domain_expiry_alert",
                 {
                     "run_id": run_id,
@@ -679,13 +772,51 @@ class LeadPipelineRunner:
                     "days_left": alert["days_left"],
                 },
             )
+            for alert in alerts
+        )
+        for alert in alerts:
             self.store.mark_domain_alert_sent(alert["job_id"], alert["days_left"])
 
+    def _record_send(self, lead_id: int, channel: str, intent: str, template_id: str, result: DeliveryResult, body: str) -> None:
+        # Persisted per send, not buffered: callers save the lead's stage/contact changes in the same
+        # store.transaction(), so a moved lead always has the touch follow-ups and closing key off.
+        # The daily counter is written first; a crash in between over-counts, keeping the warmup limit safe.
+        self.ops.add_channel_metrics(channel, sent=1, failed=0 if result.ok else 1)
+        self.store.save_touch(lead_id, channel, intent, template_id, result.status, result.message_id, body)
+
+    def _throttled_send(self, run_id: str, channel: str, send: Callable[..., DeliveryResult], *args: str) -> DeliveryResult:
+        self.throttle.wait_and_mark(channel)
+        started = time.perf_counter()
+        result = send(*args)
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        if self.throttle.record_send(channel, latency_ms, result.status, result.detail):
+            state = self.throttle.state(channel)
+            self.logger.write(
+                "channel_throttled",
+                {
+                    "run_id": run_id,
+                    "channel": channel,
+                    "detail": result.detail,
+                    "min_delay_seconds": round(state.min_delay, 3),
+                    "rate_limit_count": state.rate_limit_count,
+                },
+            )
+        return result
+
     def register_email_feedback(self, bounces: int, complaints: int, sent: int) -> None:
         self.ops.add_channel_metrics("EMAIL", sent=sent, bounces=bounces, complaints=complaints)
 
-    def _evaluate_email_health(self, run_id: str) -> None:
-        metrics = self.ops.get_channel_metrics("EMAIL")
+    def _evaluate_channel_health(self, run_id: str) -> None:
+        # One metrics read for every outreach channel, then the per-channel rules and the global switch.
+        channels = ["EMAIL"] if self.email_only else ["EMAIL", "WHATSAPP"]
+        metrics = self.ops.get_all_channel_metrics(channels)
+        with self.logger.batch():
+            self._evaluate_email_health(run_id, metrics["EMAIL"])
+            if not self.email_only:
+                self._evaluate_whatsapp_health(run_id, metrics["WHATSAPP"])
+            self._evaluate_global_safe_mode(run_id)
+
+    def _evaluate_email_health(self, run_id: str, metrics: ChannelMetrics) -> None:
         pause, reason = should_pause_email(metrics.bounce_rate, metrics.complaint_rate, self.thresholds)
         if pause:
             self.ops.set_channel_paused("EMAIL", reason, cooldown_hours=12)
@@ -702,10 +833,7 @@ class LeadPipelineRunner:
             )
             self.logger.write("deliverability_alert", {"run_id": run_id, "channel": "EMAIL", "reason": reason})
 
-    def _evaluate_whatsapp_health(self, run_id: str) -> None:
-        if self.email_only:
-            return
-        metrics = self.ops.get_channel_metrics("WHATSAPP")
+    def _evaluate_whatsapp_health(self, run_id: str, metrics: ChannelMetrics) -> None:
         pause, reason = should_pause_whatsapp(metrics.fail_rate, self.thresholds)
         if pause:
             self.ops.set_channel_paused("WHATSAPP", reason, cooldown_hours=12)
@@ -733,19 +861,12 @@ class LeadPipelineRunner:
             self.logger.write("safe_mode_disabled", {"run_id": run_id, "paused_channels": paused_count})
 
     def _campaign_day_index(self) -> int:
-        # Uses first run timestamp from ops_state run_history as campaign start.
-        db = self.cfg.ops_state_db
-        if not db.exists():
-            return 1
-        import sqlite3
-
-        with sqlite3.connect(db) as conn:
-            row = conn.execute("SELECT timestamp_utc FROM run_history ORDER BY id ASC LIMIT 1").fetchone()
-        if not row:
-            return 1
-        first = datetime.fromisoformat(str(row[0]))
-        now = datetime.now(UTC)
-        delta = now.date() - first.date()
+        # Uses first run timestamp from ops_state run_history as campaign start; it never changes once set.
+        if self._campaign_start is None:
+            self._campaign_start = self.ops.first_run_at()
+            if self._campaign_start is None:
+                return 1
+        delta = datetime.now(UTC).date() - self._campaign_start.date()
         return max(1, delta.days + 1)
 
     @staticmethod
@@ -759,7 +880,7 @@ class LeadPipelineRunner:
 
     @staticmethod
     def _lead_locale(phone: str, address: str) -> str:
-        digits = re.sub(r"\D+", "", phone or "")
+        digits = _NON_DIGITS_RE.sub("", phone or "")
         addr = (address or "").lower()
         if digits.startswith("55"):
             return "pt-BR"
@@ -769,7 +890,7 @@ class LeadPipelineRunner:
             return "pt-BR"
         if any(tok in addr for tok in ["portugal", "lisbon", "lisboa", "porto", "portimao", "portimão", "faro", "coimbra", "braga"]):
             return "pt-PT"
-        if re.search(r"\b(sp|rj|mg|ba|ce|pr|rs|sc|go|df)\b", addr):
+        if _BR_UF_RE.search(addr):
             return "pt-BR"
         if digits.startswith("34"):
             return "es"
@@ -777,6 +898,13 @@ class LeadPipelineRunner:
             return "es"
         return "en"
 
+    @staticmethod
+    def _tag_rows(rows: Iterator[dict], country_code: str, audience: str) -> Iterator[dict]:
+        for row in rows:
+            row["country_code"] = country_code
+            row["audience"] = audience
+            yield row
+
     @staticmethod
     def _country_code_for_location(location: str) -> str:
         lowered = (location or "").lower()
@@ -800,13 +928,14 @@ class LeadPipelineRunner:
             return full, simple, "brl"
         return int(pricing.price_full), int(pricing.price_simple), "eur"
 
-    def _register_incident(self, run_id: str, error_type: str, message: str, context: dict[str, str]) -> None:
-        merged_context = {"run_id": run_id, **context}
+    def _register_incident(self, run_id: str, error_type: str, message: str, context: IncidentContext) -> None:
+        short_message = message[:200]
         fingerprint = self.incident_engine.fingerprint(
             error_type=error_type,
             message=message,
             stack="pipeline_runner.ingest",
-            context=merged_context,
+            context=context,
+            run_id=run_id,
         )
         state = self.incident_engine.register(
             fingerprint=fingerprint,
@@ -821,7 +950,7 @@ class LeadPipelineRunner:
                 "level": state.level,
                 "count_window": state.count_window,
                 "error_type": error_type,
-                "message": message[:200],
+                "message": short_message,
             },
         )
         if state.should_generate_report:
@@ -829,7 +958,7 @@ class LeadPipelineRunner:
                 state=state,
                 error_type=error_type,
                 message=message,
-                context=merged_context,
+                context={"run_id": run_id, **context},
                 attempts=["ingest run", "selector fallback", "auto pause channel"],
                 impact="Ingestao de leads degradada ou interrompida.",
                 hypothesis="Mudanca de layout no Google Maps, latencia de rede, ou anti-bot temporario.",
@@ -5,26 +5,40 @@ from pathlib import Path
 
 from .config import get_config
 from .enrichment import enrich_with_website_contacts
-from .exporters import export_csv, export_xlsx
-from .incident import IncidentEngine
+from .incident import IncidentContext, IncidentEngine
 from .logging_utils import JsonlLogger
 from .ops_state import OperationalState
-from .scraper import GoogleMapsScraper, ScrapePausedError, ScrapeRequest
+from .scraper import GoogleMapsScraper, ScrapePausedError, ScrapeRequest, ScrapeRuntime
 from .time_utils import UTC
 
 
 class LeadGeneratorRunner:
-    def __init__(self) -> None:
+    def __init__(self, logger: JsonlLogger | None = None, incident_engine: IncidentEngine | None = None) -> None:
+        # A caller that already owns a logger/incident engine (e.g. the pipeline) can share them
+        # instead of opening the jsonl and incident_state.db a second time.
         self.cfg = get_config()
-        self.logger = JsonlLogger(self.cfg.log_dir / "events.jsonl")
-        self.incident_engine = IncidentEngine(
+        self.logger = logger or JsonlLogger(self.cfg.log_dir / "events.jsonl")
+        self.incident_engine = incident_engine or IncidentEngine(
             db_path=self.cfg.log_dir / "incident_state.db",
             policy=self.cfg.incident,
             incident_dir=self.cfg.log_dir / "incidents",
         )
-        self.scraper = GoogleMapsScraper()
+        self.scraper = GoogleMapsScraper(on_long_pause=self.logger.flush)
         self.ops = OperationalState(self.cfg.ops_state_db)
 
+    def __enter__(self) -> LeadGeneratorRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self.scraper.close()
+        finally:
+            self.ops.close()
+            self.incident_engine.close()
+
     def run(
         self,
         audience: str,
@@ -34,7 +48,22 @@ class LeadGeneratorRunner:
         headless: bool,
         enrich_website: bool,
     ) -> list[Path]:
-        run_id = datetime.now(UTC).strftime("run-%Y%m%dT%H%M%SZ")
+        # Run lifecycle events are buffered and appended together when the run ends.
+        with self.logger.batch():
+            return self._run(audience, location, max_results, out_format, headless, enrich_website)
+
+    def _run(
+        self,
+        audience: str,
+        location: str,
+        max_results: int,
+        out_format: str,
+        headless: bool,
+        enrich_website: bool,
+    ) -> list[Path]:
+        # One clock read and one format pass; the export file stem reuses the run's stamp.
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+        run_id = f"run-{stamp}"
         self.logger.write(
             "run_started",
             {
@@ -48,25 +77,33 @@ class LeadGeneratorRunner:
         )
 
         try:
-            result = self.scraper.scrape(
-                ScrapeRequest(
-                    audience=audience,
-                    location=location,
-                    max_results=max_results,
-                    headless=headless,
-                )
+            req = ScrapeRequest(
+                audience=audience,
+                location=location,
+                max_results=max_results,
+                headless=headless,
+                parallel_pages=self.cfg.scrape_pages,
             )
-            rows = result.rows
+            runtime = ScrapeRuntime()
+            rows_stream = self.scraper.stream_scrape(req, runtime)
             if enrich_website:
-                rows = enrich_with_website_contacts(rows, self.logger, run_id)
+                rows = enrich_with_website_contacts(rows_stream, self.logger, run_id, max_workers=self.cfg.enrich_workers)
+            else:
+                rows = list(rows_stream)
+            result = self.scraper.build_result(rows, req, runtime)
+            rows = result.rows
 
-            ts = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
-            stem = f"leads-{audience.replace(' ', '_')}-{location.replace(' ', '_')}-{ts}"
+            stem = f"leads-{audience.replace(' ', '_')}-{location.replace(' ', '_')}-{stamp}"
             files: list[Path] = []
 
-            if out_format in {"csv", "both"}:
+            # pandas (and openpyxl for xlsx) only load once there is something to export.
+            from .exporters import export_csv, export_csv_and_xlsx, export_xlsx
+
+            if out_format == "both":
+                files.extend(export_csv_and_xlsx(rows, self.cfg.output_dir / f"{stem}.csv", self.cfg.output_dir / f"{stem}.xlsx"))
+            elif out_format == "csv":
                 files.append(export_csv(rows, self.cfg.output_dir / f"{stem}.csv"))
-            if out_format in {"xlsx", "both"}:
+            elif out_format == "xlsx":
                 files.append(export_xlsx(rows, self.cfg.output_dir / f"{stem}.xlsx"))
 
             self.ops.record_run(run_id, "SCRAPE", unstable=result.unstable, reason="risk_signals" if result.unstable else "ok")
@@ -98,7 +135,7 @@ class LeadGeneratorRunner:
         except Exception as exc:
             message = str(exc)
             error_type = exc.__class__.__name__
-            context = {
+            context: IncidentContext = {
                 "run_id": run_id,
                 "audience": audience,
                 "location": location,
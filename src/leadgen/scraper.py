@@ -2,14 +2,77 @@ from __future__ import annotations
 
 import random
 import re
+import sys
 import time
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterator
 from urllib.parse import quote_plus
 
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError, sync_playwright
-
-
-@dataclass
+from .throttle import is_rate_limited
+
+# Playwright is imported where it is used, so importing the runners (and the test suite) does not load it.
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
+
+RISK_CHECK_INTERVAL_SECONDS = 2.0
+# The load-more loop scrolls every ~2s; probing on every scroll is mostly wasted CDP traffic.
+RISK_PROBE_EVERY_N_SCROLLS = 5
+# One load-more step: -1 without a results feed; otherwise the card count before scrolling. When more
+# cards are needed it scrolls the feed and waits up to waitMs for new ones.
+_LOAD_MORE_STEP_JS = """async ({ max, waitMs }) => {
+    const panel = document.querySelector('div[role="feed"]');
+    if (!panel) return -1;
+    const count = () => document.querySelectorAll('a.hfpxzc').length;
+    const n = count();
+    if (n === 0 || n >= max) return n;
+    panel.scrollBy(0, 2400);
+    const deadline = Date.now() + waitMs;
+    while (count() <= n && Date.now() < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, 100));
+    }
+    return n;
+}"""
+_LINK_HREFS_JS = "(els) => els.map((el) => el.getAttribute('href') || '')"
+# "detected unusual traffic" is already covered by "unusual traffic". The interstitial text sits at the top
+# of the page, so only the first 20k characters are tested instead of a long results panel.
+_RISK_PROBE_JS = "() => /captcha|unusual traffic/i.test(((document.body && document.body.innerText) || '').slice(0, 20000))"
+# The rating header shows "4,8 (123)"; the word "avaliacoes"/"reviews" only lives in its aria-labels.
+# Layouts without the F7nice header still expose the count on the reviews-chart button's aria-label.
+_REVIEWS_TEXT_JS = """() => {
+    const box = document.querySelector('div.F7nice') || document.querySelector('button[jsaction*="pane.reviewChart"]');
+    if (!box) return '';
+    const labels = Array.from(box.querySelectorAll('[aria-label]'), (el) => el.getAttribute('aria-label') || '');
+    return [box.innerText || '', box.getAttribute('aria-label') || '', ...labels].join(' ');
+}"""
+# All per-place fields in one CDP round-trip; selectors match the _safe_* fallback path in _extract_place.
+_EXTRACT_PLACE_JS = """() => {
+    const text = (sel) => { const el = document.querySelector(sel); return el ? (el.innerText || '').trim() : ''; };
+    const attr = (sel, key) => { const el = document.querySelector(sel); return el ? (el.getAttribute(key) || '').trim() : ''; };
+    const box = document.querySelector('div.F7nice') || document.querySelector('button[jsaction*="pane.reviewChart"]');
+    const labels = box ? Array.from(box.querySelectorAll('[aria-label]'), (el) => el.getAttribute('aria-label') || '') : [];
+    return {
+        name: text('h1.DUwDvf'),
+        rating_raw: text('div.F7nice span span'),
+        reviews_raw: box ? [box.innerText || '', box.getAttribute('aria-label') || '', ...labels].join(' ') : '',
+        address: text('button[data-item-id="address"]'),
+        website: attr('a[data-item-id="authority"]', 'href'),
+        phone: text('button[data-item-id^="phone"]'),
+        category: text('button[jsaction*="pane.rating.category"]'),
+    };
+}"""
+# Installed once per context so each place only ships the short call stub; the stub returns null on
+# pages where the init script did not run and _extract_place then sends the full function.
+_EXTRACT_PLACE_INIT_JS = f"window.__leadgenExtractPlace = {_EXTRACT_PLACE_JS};"
+_EXTRACT_PLACE_CALL_JS = "() => (window.__leadgenExtractPlace ? window.__leadgenExtractPlace() : null)"
+_SAFE_TEXT_JS = "(sel) => { const el = document.querySelector(sel); return el ? (el.innerText || '') : ''; }"
+_SAFE_ATTR_JS = "([sel, key]) => { const el = document.querySelector(sel); return el ? (el.getAttribute(key) || '') : ''; }"
+_RATING_RE = re.compile(r"\d+[\.,]?\d*")
+_REVIEWS_RE = re.compile(r"([\d\.,]+)\s*(avaliac|review)", re.IGNORECASE)
+# "4,8" -> "4.8" in one pass.
+_RATING_TRANS = str.maketrans({",": "."})
+
+
+@dataclass(slots=True)
 class ScrapeRequest:
     audience: str
     location: str
@@ -21,9 +84,10 @@ class ScrapeRequest:
     long_pause_min_ms: int = 45000
     long_pause_max_ms: int = 90000
     max_consecutive_errors: int = 3
+    parallel_pages: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapeResult:
     rows: list[dict]
     paused: bool
@@ -35,13 +99,19 @@ class ScrapeResult:
     unstable: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapeRuntime:
     captcha_events: int = 0
     timeout_events: int = 0
     http_429_events: int = 0
     consecutive_errors: int = 0
     consecutive_error_peak: int = 0
+    last_risk_check_ts: float = 0.0
+
+    def bump_errors(self) -> None:
+        self.consecutive_errors += 1
+        if self.consecutive_errors > self.consecutive_error_peak:
+            self.consecutive_error_peak = self.consecutive_errors
 
 
 class ScrapePausedError(RuntimeError):
@@ -49,24 +119,96 @@ class ScrapePausedError(RuntimeError):
 
 
 class GoogleMapsScraper:
+    """Google Maps scraper that keeps one Chromium alive across scrapes; each scrape gets a fresh context.
+
+    The browser starts on the first scrape. Finished contexts are emptied (tabs and cookies) and
+    kept for the next scrape instead of being rebuilt. Call ``close()`` (or use the scraper as a
+    context manager) to shut it down. Like the sync Playwright API, an instance must stay on one thread.
+    """
+
+    def __init__(self, on_long_pause: Callable[[], None] | None = None) -> None:
+        # Background work (e.g. flushing buffered logs) to overlap with the long anti-ban pauses.
+        self.on_long_pause = on_long_pause
+        self._playwright = None
+        self._browser = None
+        self._browser_headless: bool | None = None
+        self._idle_contexts: list = []
+
+    def __enter__(self) -> GoogleMapsScraper:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = self._browser_headless = None
+        # Pooled contexts belong to this browser and close with it.
+        self._idle_contexts.clear()
+        try:
+            if browser is not None:
+                browser.close()
+        finally:
+            if playwright is not None:
+                playwright.stop()
+
+    def _get_browser(self, headless: bool):
+        if self._browser is not None and (self._browser_headless != headless or not self._browser.is_connected()):
+            self.close()
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=headless)
+            self._browser_headless = headless
+        return self._browser
+
+    def _acquire_context(self, headless: bool):
+        browser = self._get_browser(headless)
+        if self._idle_contexts:
+            return self._idle_contexts.pop()
+        context = browser.new_context()
+        context.add_init_script(_EXTRACT_PLACE_INIT_JS)
+        return context
+
+    def _release_context(self, context) -> None:
+        try:
+            for page in list(context.pages):
+                page.close()
+            context.clear_cookies()
+        except Exception:
+            try:
+                context.close()
+            except Exception:
+                pass
+            return
+        self._idle_contexts.append(context)
+
     def scrape(self, req: ScrapeRequest) -> ScrapeResult:
-        query = f"{req.audience} em {req.location}"
         runtime = ScrapeRuntime()
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=req.headless)
-            context = browser.new_context()
+        rows = list(self.stream_scrape(req, runtime))
+        return self.build_result(rows, req, runtime)
+
+    def stream_scrape(self, req: ScrapeRequest, runtime: ScrapeRuntime) -> Iterator[dict]:
+        # Yields each place as soon as it is extracted so callers can overlap enrichment with scraping.
+        # Every row carries this query; interned so rows and downstream dict keys share one object.
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        query = sys.intern(f"{req.audience} em {req.location}")
+        context = self._acquire_context(req.headless)
+        try:
             page = context.new_page()
             try:
                 page.goto("https://www.google.com/maps", timeout=90000)
-                self._random_pause(req)
+                self._random_pause(req, page)
                 self._accept_possible_consent(page)
                 self._fill_search_query(page, query)
                 page.keyboard.press("Enter")
-                self._random_pause(req)
+                self._random_pause(req, page)
             except PlaywrightTimeoutError:
                 # Fallback robusto: abre direto a URL de busca, sem depender do input inicial.
                 page.goto(f"https://www.google.com/maps/search/{quote_plus(query)}?entry=ttu", timeout=90000)
-                self._random_pause(req)
+                self._random_pause(req, page)
 
             self._wait_for_initial_results(page, timeout_ms=25000)
             self._load_more_results(page, req.max_results, req, runtime)
@@ -74,42 +216,58 @@ class GoogleMapsScraper:
             links = self._result_links_locator(page)
             hrefs = self._collect_place_links(links, req.max_results)
             total = len(hrefs)
-            rows: list[dict] = []
-
-            for idx in range(total):
+            # Different result links can resolve to the same place; skip the DOM reads for places already emitted.
+            seen_urls: set[str] = set()
+            # Extra tabs in the same context load the next places while the current ones are read.
+            workers = [page] + [context.new_page() for _ in range(max(1, req.parallel_pages) - 1)]
+            width = len(workers)
+            long_pause_every = max(1, req.long_pause_every_n)
+
+            for start in range(0, total, width):
                 self._detect_risk_signals(page, runtime)
                 self._assert_not_paused(req, runtime)
-                try:
-                    page.goto(hrefs[idx], timeout=25000)
-                    self._random_pause(req)
-                    rows.append(self._extract_place(page, query))
-                    runtime.consecutive_errors = 0
-                except PlaywrightTimeoutError:
-                    runtime.timeout_events += 1
-                    runtime.consecutive_errors += 1
-                    runtime.consecutive_error_peak = max(runtime.consecutive_error_peak, runtime.consecutive_errors)
-                    continue
-                except Exception as exc:
-                    msg = str(exc).lower()
-                    if "429" in msg:
-                        runtime.http_429_events += 1
-                    runtime.consecutive_errors += 1
-                    runtime.consecutive_error_peak = max(runtime.consecutive_error_peak, runtime.consecutive_errors)
-                    continue
-
-                if (idx + 1) % max(1, req.long_pause_every_n) == 0:
-                    self._long_pause(req)
-
-            context.close()
-            browser.close()
-
-        unique = {}
+                loading: list[Page] = []
+                for worker, href in zip(workers, hrefs[start : start + width]):
+                    try:
+                        # "commit" returns as soon as the navigation starts, so the batch loads side by side.
+                        worker.goto(href, timeout=25000, wait_until="commit")
+                        loading.append(worker)
+                    except Exception as exc:
+                        self._record_place_error(runtime, exc)
+                self._random_pause(req, page)
+
+                for worker in loading:
+                    try:
+                        self._wait_for_place(worker)
+                        row = None if worker.url in seen_urls else self._extract_place(worker, query)
+                        runtime.consecutive_errors = 0
+                    except Exception as exc:
+                        self._record_place_error(runtime, exc)
+                        continue
+                    if row is not None:
+                        seen_urls.add(row["maps_url"])
+                        yield row
+
+                done = min(start + width, total)
+                if done // long_pause_every > start // long_pause_every:
+                    self._long_pause(req, page)
+        finally:
+            self._release_context(context)
+
+    def build_result(self, rows: list[dict], req: ScrapeRequest, runtime: ScrapeRuntime) -> ScrapeResult:
+        unique: list[dict] = []
+        seen: set[str] = set()
         for row in rows:
-            unique[row.get("maps_url", f"fallback-{time.time_ns()}")] = row
+            maps_url = row.get("maps_url")
+            # A place without its maps URL cannot be deduplicated or upserted; drop it.
+            if not maps_url or maps_url in seen:
+                continue
+            seen.add(maps_url)
+            unique.append(row)
 
         unstable = runtime.captcha_events > 0 or runtime.timeout_events >= req.max_consecutive_errors or runtime.http_429_events > 0
         return ScrapeResult(
-            rows=list(unique.values()),
+            rows=unique,
             paused=False,
             pause_reason="",
             captcha_events=runtime.captcha_events,
@@ -137,6 +295,8 @@ class GoogleMapsScraper:
                 return
             except Exception:
                 continue
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
         raise PlaywrightTimeoutError("searchbox_not_found")
 
     def _result_links_locator(self, page: Page):
@@ -158,14 +318,15 @@ class GoogleMapsScraper:
     def _collect_place_links(self, links, max_results: int) -> list[str]:
         hrefs: list[str] = []
         seen: set[str] = set()
-        for idx in range(links.count()):
+        # Every card's href in one round-trip instead of a handle (and a get_attribute call) per card.
+        try:
+            raw_hrefs = links.evaluate_all(_LINK_HREFS_JS)
+        except Exception:
+            return hrefs
+        for raw in raw_hrefs:
             if len(hrefs) >= max_results:
                 break
-            href = ""
-            try:
-                href = str(links.nth(idx).get_attribute("href") or "").strip()
-            except Exception:
-                continue
+            href = str(raw or "").strip()
             if "/maps/place/" not in href:
                 continue
             if href in seen:
@@ -186,34 +347,35 @@ class GoogleMapsScraper:
             try:
                 if btn.count() > 0:
                     btn.click(timeout=2000)
-                    time.sleep(1.0)
+                    page.wait_for_load_state("domcontentloaded", timeout=5000)
                     return
             except Exception:
                 continue
 
     def _load_more_results(self, page: Page, max_results: int, req: ScrapeRequest, runtime: ScrapeRuntime) -> None:
-        panel = page.locator('div[role="feed"]')
-        if panel.count() == 0:
-            return
-
         prev_count = 0
         stable_rounds = 0
         zero_rounds = 0
+        scrolls = 0
         start_ts = time.time()
         while True:
-            self._detect_risk_signals(page, runtime)
+            if stable_rounds == 0 and scrolls % RISK_PROBE_EVERY_N_SCROLLS == 0:
+                self._detect_risk_signals(page, runtime)
             self._assert_not_paused(req, runtime)
             if (time.time() - start_ts) > 120:
                 return
 
-            cards = page.locator('a.hfpxzc').count()
+            # Count, scroll and wait for new cards in one round-trip; the human pause bounds the wait.
+            cards = int(page.evaluate(_LOAD_MORE_STEP_JS, {"max": max_results, "waitMs": self._action_delay_ms(req)}))
+            if cards < 0:
+                return
             if cards >= max_results:
                 return
-            if cards <= 0:
+            if cards == 0:
                 zero_rounds += 1
                 if zero_rounds >= 6:
                     return
-                self._random_pause(req)
+                self._random_pause(req, page)
                 continue
 
             zero_rounds = 0
@@ -226,33 +388,43 @@ class GoogleMapsScraper:
                 return
 
             prev_count = cards
-            panel.evaluate("el => el.scrollBy(0, 2400)")
-            self._random_pause(req)
+            scrolls += 1
 
     def _wait_for_initial_results(self, page: Page, timeout_ms: int = 25000) -> None:
-        deadline = time.time() + (timeout_ms / 1000.0)
-        while time.time() < deadline:
-            for selector in ('a.hfpxzc', 'div[role="feed"] a[href*="/maps/place/"]', '[role="article"]'):
-                try:
-                    if page.locator(selector).count() > 0:
-                        return
-                except Exception:
-                    continue
-            time.sleep(0.5)
+        # One selector list lets the browser signal the first result instead of polling each selector.
+        try:
+            page.wait_for_selector(
+                'a.hfpxzc, div[role="feed"] a[href*="/maps/place/"], [role="article"]',
+                state="attached",
+                timeout=timeout_ms,
+            )
+        except Exception:
+            return
 
     def _detect_risk_signals(self, page: Page, runtime: ScrapeRuntime) -> None:
+        # Back-to-back callers (load-more loop, then the place loop) share one probe.
+        now = time.monotonic()
+        if runtime.last_risk_check_ts and (now - runtime.last_risk_check_ts) < RISK_CHECK_INTERVAL_SECONDS:
+            return
+        runtime.last_risk_check_ts = now
         try:
-            danger = (
-                page.locator("text=/captcha/i").count() > 0
-                or page.locator("text=/unusual traffic/i").count() > 0
-                or page.locator("text=/detected unusual traffic/i").count() > 0
-            )
+            # One in-page test instead of a locator round-trip per phrase; only a bool crosses CDP.
+            danger = bool(page.evaluate(_RISK_PROBE_JS))
         except Exception:
             return
         if danger:
             runtime.captcha_events += 1
-            runtime.consecutive_errors += 1
-            runtime.consecutive_error_peak = max(runtime.consecutive_error_peak, runtime.consecutive_errors)
+            runtime.bump_errors()
+
+    @staticmethod
+    def _record_place_error(runtime: ScrapeRuntime, exc: Exception) -> None:
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        if isinstance(exc, PlaywrightTimeoutError):
+            runtime.timeout_events += 1
+        elif is_rate_limited("", str(exc)):
+            runtime.http_429_events += 1
+        runtime.bump_errors()
 
     def _assert_not_paused(self, req: ScrapeRequest, runtime: ScrapeRuntime) -> None:
         if runtime.consecutive_errors >= req.max_consecutive_errors:
@@ -267,69 +439,102 @@ class GoogleMapsScraper:
             raise ScrapePausedError(f"SCRAPE_PAUSED:{suffix}")
 
     def _extract_place(self, page: Page, search_query: str) -> dict:
-        name = self._safe_text(page, "h1.DUwDvf")
-        rating_raw = self._safe_text(page, "div.F7nice span span")
-        rating = self._extract_rating(rating_raw)
-        reviews = self._extract_reviews(page.content())
-
-        address = self._safe_text(page, 'button[data-item-id="address"]')
-        website = self._safe_attr(page, 'a[data-item-id="authority"]', "href")
-        phone = self._safe_text(page, 'button[data-item-id^="phone"]')
-        category = self._safe_text(page, 'button[jsaction*="pane.rating.category"]')
+        try:
+            data = page.evaluate(_EXTRACT_PLACE_CALL_JS)
+            if data is None:
+                data = page.evaluate(_EXTRACT_PLACE_JS)
+            data = data or {}
+        except Exception:
+            # Page still settling: fall back to one locator read per field.
+            data = {
+                "name": self._safe_text(page, "h1.DUwDvf"),
+                "rating_raw": self._safe_text(page, "div.F7nice span span"),
+                "reviews_raw": self._reviews_text(page),
+                "address": self._safe_text(page, 'button[data-item-id="address"]'),
+                "website": self._safe_attr(page, 'a[data-item-id="authority"]', "href"),
+                "phone": self._safe_text(page, 'button[data-item-id^="phone"]'),
+                "category": self._safe_text(page, 'button[jsaction*="pane.rating.category"]'),
+            }
 
         return {
             "search_query": search_query,
-            "name": name,
-            "category": category,
-            "rating": rating,
-            "reviews": reviews,
-            "phone": phone,
-            "website": website,
-            "address": address,
+            "name": str(data.get("name") or ""),
+            # Categories repeat across most places of one search.
+            "category": sys.intern(str(data.get("category") or "")),
+            "rating": self._extract_rating(str(data.get("rating_raw") or "")),
+            "reviews": self._extract_reviews(str(data.get("reviews_raw") or "")),
+            "phone": str(data.get("phone") or ""),
+            "website": str(data.get("website") or ""),
+            "address": str(data.get("address") or ""),
             "maps_url": page.url,
         }
 
     @staticmethod
     def _safe_text(page: Page, selector: str) -> str:
-        loc = page.locator(selector)
-        if loc.count() == 0:
-            return ""
+        # Lookup and read in one round-trip; a missing element just yields "".
         try:
-            return loc.first.inner_text(timeout=1000).strip()
+            return str(page.evaluate(_SAFE_TEXT_JS, selector) or "").strip()
         except Exception:
             return ""
 
     @staticmethod
     def _safe_attr(page: Page, selector: str, attr: str) -> str:
-        loc = page.locator(selector)
-        if loc.count() == 0:
-            return ""
         try:
-            value = loc.first.get_attribute(attr, timeout=1000)
-            return (value or "").strip()
+            return str(page.evaluate(_SAFE_ATTR_JS, [selector, attr]) or "").strip()
         except Exception:
             return ""
 
     @staticmethod
     def _extract_rating(raw: str) -> str:
-        match = re.search(r"\d+[\.,]?\d*", raw or "")
-        return match.group(0).replace(",", ".") if match else ""
+        match = _RATING_RE.search(raw or "")
+        return match.group(0).translate(_RATING_TRANS) if match else ""
+
+    @staticmethod
+    def _extract_reviews(text: str) -> str:
+        # Counts are integers, so any "." or "," inside one is a thousands separator: keep digits only.
+        # The header's "(1.234)" is parsed without regex; the aria-label form is the fallback.
+        open_idx = text.find("(")
+        if open_idx != -1:
+            close_idx = text.find(")", open_idx)
+            if close_idx != -1:
+                digits = "".join(ch for ch in text[open_idx + 1 : close_idx] if ch.isdigit())
+                if digits:
+                    return digits
+        match = _REVIEWS_RE.search(text)
+        return "".join(ch for ch in match.group(1) if ch.isdigit()) if match else ""
 
     @staticmethod
-    def _extract_reviews(html: str) -> str:
-        match = re.search(r"([\d\.,]+)\s*(avaliac|review)", html, flags=re.IGNORECASE)
-        if not match:
+    def _reviews_text(page: Page) -> str:
+        try:
+            return str(page.evaluate(_REVIEWS_TEXT_JS) or "")
+        except Exception:
             return ""
-        return match.group(1).replace(".", "").replace(",", ".")
 
     @staticmethod
-    def _random_pause(req: ScrapeRequest) -> None:
+    def _wait_for_place(page: Page) -> None:
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        # The place header is what extraction needs; full "load" also waits for images and tiles.
+        try:
+            page.wait_for_selector("h1.DUwDvf", timeout=10000)
+        except PlaywrightTimeoutError:
+            page.wait_for_load_state("load", timeout=15000)
+
+    @staticmethod
+    def _action_delay_ms(req: ScrapeRequest) -> float:
         low = max(100, req.min_action_delay_ms)
         high = max(low, req.max_action_delay_ms)
-        time.sleep(random.uniform(low / 1000.0, high / 1000.0))
+        return random.uniform(low, high)
 
-    @staticmethod
-    def _long_pause(req: ScrapeRequest) -> None:
+    @classmethod
+    def _random_pause(cls, req: ScrapeRequest, page: Page) -> None:
+        # wait_for_timeout keeps the driver servicing page events during the pause, unlike time.sleep.
+        page.wait_for_timeout(cls._action_delay_ms(req))
+
+    def _long_pause(self, req: ScrapeRequest, page: Page) -> None:
+        # Run inline: the pause is idle time anyway, and a background thread could be killed mid-write at exit.
+        if self.on_long_pause is not None:
+            self.on_long_pause()
         low = max(500, req.long_pause_min_ms)
         high = max(low, req.long_pause_max_ms)
-        time.sleep(random.uniform(low / 1000.0, high / 1000.0))
+        page.wait_for_timeout(random.uniform(low, high))
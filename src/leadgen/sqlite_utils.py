@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+
+class _DeferredCommitConnection:
+    """Connection proxy handed out inside ``transaction()``: ``with conn:`` blocks and ``commit()``
+    calls of the wrapped store methods are no-ops, so only the outer block commits."""
+
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> _DeferredCommitConnection:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def commit(self) -> None:
+        return None
+
+
+class ThreadLocalConnections:
+    """One reusable sqlite3 connection per thread for a single database file.
+
+    The database is switched to WAL on first use, so readers in other threads (enrichment
+    workers, follow-up sub-phases, the API server) are not blocked by a writer. Connections of
+    threads that have finished are closed whenever a new one is opened; ``close_all()`` closes
+    the rest on shutdown.
+    """
+
+    def __init__(self, db_path: Path, row_factory: Callable[[sqlite3.Cursor, tuple], Any] | None = None) -> None:
+        self.db_path = db_path
+        self.row_factory = row_factory
+        self._local = threading.local()
+        self._wal_lock = threading.Lock()
+        self._wal_ready = False
+        self._open_lock = threading.Lock()
+        self._open: list[tuple[threading.Thread, sqlite3.Connection]] = []
+        self._generation = 0
+
+    def get(self) -> sqlite3.Connection:
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            return tx
+        return self._raw()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run every call made by this thread inside the block as one transaction (one commit)."""
+        outer = getattr(self._local, "tx", None)
+        if outer is not None:
+            yield outer
+            return
+        conn = self._raw()
+        conn.execute("BEGIN")
+        self._local.tx = _DeferredCommitConnection(conn)
+        try:
+            yield self._local.tx
+        except BaseException:
+            self._local.tx = None
+            conn.rollback()
+            raise
+        self._local.tx = None
+        conn.commit()
+
+    def close(self) -> None:
+        """Close the calling thread's connection; its next ``get()`` reconnects."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._open_lock:
+            self._open = [(t, c) for t, c in self._open if c is not conn]
+        conn.close()
+
+    def close_all(self) -> None:
+        """Close every connection opened through this object, in any thread; later ``get()`` calls reconnect."""
+        with self._open_lock:
+            opened, self._open = self._open, []
+            self._generation += 1
+        for _thread, conn in opened:
+            conn.close()
+
+    def _raw(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "generation", -1) != self._generation:
+            # check_same_thread=False only so close_all() can close it; each connection is still used by one thread.
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            if self.row_factory is not None:
+                conn.row_factory = self.row_factory
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._ensure_wal(conn)
+            self._local.conn = conn
+            self._local.generation = self._track(conn)
+        return conn
+
+    def _track(self, conn: sqlite3.Connection) -> int:
+        # Pool workers (follow-ups, enrichment, API request threads) come and go; close what the dead ones left open.
+        current = threading.current_thread()
+        with self._open_lock:
+            finished = [c for t, c in self._open if not t.is_alive()]
+            self._open = [(t, c) for t, c in self._open if t.is_alive()]
+            self._open.append((current, conn))
+            generation = self._generation
+        for stale in finished:
+            stale.close()
+        return generation
+
+    def _ensure_wal(self, conn: sqlite3.Connection) -> None:
+        # journal_mode is persistent in the file; only the first connection needs to set it.
+        if self._wal_ready:
+            return
+        with self._wal_lock:
+            if not self._wal_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                self._wal_ready = True
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+# One pass over the text instead of a substring scan per token; 503 is the other common throttling reply.
+_RATE_LIMIT_RE = re.compile(r"\b(?:429|503)\b|rate[ _]limit|too many requests", re.IGNORECASE)
+
+
+@dataclass
+class ThrottleState:
+    last_request: float = 0.0
+    min_delay: float = 0.5
+    base_delay: float = 0.5
+    avg_latency_ms: float = 0.0
+    rate_limit_count: int = 0
+    paused_until: float = 0.0
+
+    def next_allowed_at(self) -> float:
+        # Slow providers widen the gap on their own (EMA latency), rate limits widen min_delay.
+        delay = max(self.min_delay, self.avg_latency_ms / 1000.0)
+        return max(self.last_request + delay, self.paused_until)
+
+    def update_latency(self, latency_ms: float, alpha: float = 0.3) -> None:
+        if self.avg_latency_ms <= 0:
+            self.avg_latency_ms = latency_ms
+        else:
+            self.avg_latency_ms = (alpha * latency_ms) + ((1 - alpha) * self.avg_latency_ms)
+
+    def signal_rate_limit(self, cooldown: timedelta, now: float, max_delay: float) -> None:
+        self.rate_limit_count += 1
+        self.min_delay = min(max_delay, self.min_delay * 1.5)
+        self.paused_until = max(self.paused_until, now + cooldown.total_seconds())
+
+    def signal_success(self) -> None:
+        self.min_delay = max(self.base_delay, self.min_delay * 0.9)
+
+
+def is_rate_limited(status: str, detail: str) -> bool:
+    return bool(_RATE_LIMIT_RE.search(status or "") or _RATE_LIMIT_RE.search(detail or ""))
+
+
+class SendThrottle:
+    """Per-channel adaptive delay between outbound sends.
+
+    Healthy channels only wait ``min_delay`` (or the observed provider latency, whichever is
+    larger); a rate-limit signal pauses the channel and widens its delay by 1.5x. Safe to share
+    between threads: each caller reserves its send slot under a lock and sleeps outside it.
+    With ``pace=False`` (dev/CI/backtests) sends are not spaced out, but rate-limit pauses still apply.
+    """
+
+    def __init__(
+        self,
+        min_delay_seconds: float | None = None,
+        max_delay_seconds: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        pace: bool = True,
+    ) -> None:
+        if min_delay_seconds is None:
+            min_delay_seconds = float(os.getenv("LEADGEN_SEND_MIN_DELAY_SECONDS", "0.5") or "0.5")
+        if max_delay_seconds is None:
+            max_delay_seconds = float(os.getenv("LEADGEN_SEND_MAX_DELAY_SECONDS", "30") or "30")
+        self.min_delay_seconds = max(0.0, min_delay_seconds)
+        self.max_delay_seconds = max(self.min_delay_seconds, max_delay_seconds)
+        self._sleep = sleep
+        self._clock = clock
+        self.pace = pace
+        self._states: dict[str, ThrottleState] = {}
+        self._lock = threading.Lock()
+
+    def state(self, channel: str) -> ThrottleState:
+        st = self._states.get(channel)
+        if st is None:
+            st = ThrottleState(min_delay=self.min_delay_seconds, base_delay=self.min_delay_seconds)
+            self._states[channel] = st
+        return st
+
+    def wait_and_mark(self, channel: str) -> float:
+        with self._lock:
+            st = self.state(channel)
+            now = self._clock()
+            slot = now
+            if st.last_request or st.paused_until:
+                slot = max(now, st.next_allowed_at() if self.pace else st.paused_until)
+            st.last_request = slot
+        waited = slot - now
+        if waited > 0:
+            self._sleep(waited)
+        return waited
+
+    def record_send(
+        self,
+        channel: str,
+        latency_ms: float,
+        status: str,
+        detail: str,
+        cooldown: timedelta = timedelta(seconds=30),
+    ) -> bool:
+        with self._lock:
+            st = self.state(channel)
+            st.update_latency(latency_ms)
+            if is_rate_limited(status, detail):
+                st.signal_rate_limit(cooldown, now=self._clock(), max_delay=self.max_delay_seconds)
+                return True
+            if status == "sent":
+                st.signal_success()
+            return False
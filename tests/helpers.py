@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable
+
+
+def bulk_update(db: Path, sql: str, rows: Iterable[tuple[Any, ...]]) -> None:
+    # Test-only fixture writes: all rows in one transaction, without the fsync on commit.
+    # journal_mode is left alone because the stores under test keep the file in WAL with
+    # their own connections open.
+    with sqlite3.connect(db) as conn:
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executemany(sql, rows)
+        conn.commit()
+
+
+def force_update(db: Path, sql: str, params: tuple[Any, ...] = ()) -> None:
+    bulk_update(db, sql, [params])
+
+
+def clear_tables(db: Path) -> None:
+    # Empties every table (and AUTOINCREMENT counters) in one transaction, keeping the schema.
+    with sqlite3.connect(db) as conn:
+        conn.execute("PRAGMA synchronous=OFF")
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        for table in tables:
+            conn.execute(f'DELETE FROM "{table}"')
+        conn.commit()
@@ -14,6 +14,8 @@ from leadgen.anti_ban import (
 )
 from leadgen.ops_state import OperationalState
 
+from helpers import force_update
+
 
 class AntiBanTests(unittest.TestCase):
     def setUp(self) -> None:
@@ -64,14 +66,29 @@ class OpsStateTests(unittest.TestCase):
             ops = OperationalState(db)
             ops.set_channel_paused("EMAIL", "bounce_rate", cooldown_hours=12)
             # Force cooldown expiration in DB.
-            import sqlite3
-
-            with sqlite3.connect(db) as conn:
-                conn.execute("UPDATE channel_status SET cooldown_until_utc='1970-01-01T00:00:00+00:00' WHERE channel='EMAIL'")
-                conn.commit()
+            force_update(db, "UPDATE channel_status SET cooldown_until_utc='1970-01-01T00:00:00+00:00' WHERE channel='EMAIL'")
             self.assertFalse(ops.is_channel_paused("EMAIL"))
             self.assertEqual(ops.count_paused_channels(["EMAIL"]), 0)
 
+    def test_first_run_at_is_earliest_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ops = OperationalState(Path(tmp) / "ops.db")
+            self.assertIsNone(ops.first_run_at())
+            ops.record_run("run-1", "SCRAPE", unstable=False, reason="ok")
+            first = ops.first_run_at()
+            ops.record_run("run-2", "SCRAPE", unstable=False, reason="ok")
+            self.assertEqual(ops.first_run_at(), first)
+
+    def test_all_channel_metrics_matches_single_reads(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ops = OperationalState(Path(tmp) / "ops.db")
+            ops.add_channel_metrics("EMAIL", sent=10, bounces=1)
+            ops.add_channel_metrics("WHATSAPP", sent=4, failed=2)
+            metrics = ops.get_all_channel_metrics(["EMAIL", "WHATSAPP", "SCRAPE"])
+            for channel in ("EMAIL", "WHATSAPP", "SCRAPE"):
+                self.assertEqual(metrics[channel], ops.get_channel_metrics(channel))
+            self.assertEqual(metrics["WHATSAPP"].failed, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest import mock
+
+from leadgen.config import _env_int
+
+
+class EnvIntTests(unittest.TestCase):
+    def test_valid_value_is_used_and_clamped(self) -> None:
+        with mock.patch.dict(os.environ, {"LEADGEN_ENRICH_WORKERS": " 4 "}):
+            self.assertEqual(_env_int("LEADGEN_ENRICH_WORKERS", 8), 4)
+        with mock.patch.dict(os.environ, {"LEADGEN_ENRICH_WORKERS": "0"}):
+            self.assertEqual(_env_int("LEADGEN_ENRICH_WORKERS", 8), 1)
+
+    def test_blank_or_malformed_value_falls_back_to_default(self) -> None:
+        for raw in ["", "   ", "eight", "2.5"]:
+            with mock.patch.dict(os.environ, {"LEADGEN_ENRICH_WORKERS": raw}):
+                self.assertEqual(_env_int("LEADGEN_ENRICH_WORKERS", 8), 8, raw)
+            with mock.patch.dict(os.environ, {"LEADGEN_SCRAPE_PAGES": raw}):
+                self.assertEqual(_env_int("LEADGEN_SCRAPE_PAGES", 1), 1, raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -102,6 +102,19 @@ class EnrichmentMergeTests(unittest.TestCase):
                 out = enrich_with_website_contacts(rows, _Logger(), run_id="t-2", store=store)
         self.assertEqual(out[0].get("email", ""), "")
 
+    def test_streamed_rows_keep_order_with_workers(self) -> None:
+        def _rows():
+            for idx in range(6):
+                yield {"name": f"Studio {idx}", "website": "", "address": "Madrid, Spain", "country_code": "ES", "audience": "abogado"}
+
+        class _Logger:
+            def write(self, *_args, **_kwargs):
+                return None
+
+        with patch("leadgen.enrichment.fetch_contacts_for_lead", return_value=[]):
+            out = enrich_with_website_contacts(_rows(), _Logger(), run_id="t-3", max_workers=4)
+        self.assertEqual([row["name"] for row in out], [f"Studio {idx}" for idx in range(6)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import hashlib
+import unittest
+
+from leadgen.incident import IncidentEngine
+
+
+class IncidentFingerprintTests(unittest.TestCase):
+    def test_run_id_is_part_of_fingerprint(self) -> None:
+        context = {"reason": "no_contact"}
+        a = IncidentEngine.fingerprint("ingest", "boom", "stack", context, run_id="r1")
+        self.assertEqual(a, IncidentEngine.fingerprint("ingest", "boom", "stack", context, run_id="r1"))
+        self.assertNotEqual(a, IncidentEngine.fingerprint("ingest", "boom", "stack", context, run_id="r2"))
+        self.assertEqual(len(a), 20)
+
+    def test_fingerprint_matches_legacy_merged_context_hash(self) -> None:
+        # Fingerprints key open incident windows, so they must not change across upgrades.
+        context = {"stage": "ingest", "max_results": 20}
+        legacy = hashlib.sha256(
+            "ingest|boom|stack|{'run_id': 'r1', 'stage': 'ingest', 'max_results': 20}".encode("utf-8")
+        ).hexdigest()[:20]
+        self.assertEqual(IncidentEngine.fingerprint("ingest", "boom", "stack", context, run_id="r1"), legacy)
+        self.assertEqual(IncidentEngine.fingerprint("ingest", "boom", "stack", {"run_id": "r1", **context}), legacy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from leadgen.logging_utils import JsonlLogger
+
+
+class JsonlLoggerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "events.jsonl"
+        self.logger = JsonlLogger(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _events(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        return [json.loads(line) for line in self.path.read_text(encoding="utf-8").splitlines()]
+
+    def test_batch_defers_writes_until_exit(self) -> None:
+        with self.logger.batch():
+            self.logger.write("run_started", {"run_id": "r1"})
+            self.logger.write_many([("lead_closed_lost", {"lead_id": 1}), ("lead_closed_lost", {"lead_id": 2})])
+            self.assertEqual(self._events(), [])
+        events = self._events()
+        self.assertEqual([e["event_type"] for e in events], ["run_started", "lead_closed_lost", "lead_closed_lost"])
+        self.assertEqual(events[2]["payload"], {"lead_id": 2})
+
+    def test_batch_flushes_when_buffer_is_full(self) -> None:
+        self.logger.batch_flush_every = 2
+        with self.logger.batch():
+            self.logger.write("a", {})
+            self.logger.write("b", {})
+            self.assertEqual(len(self._events()), 2)
+            self.logger.write("c", {})
+        self.assertEqual([e["event_type"] for e in self._events()], ["a", "b", "c"])
+
+    def test_flush_persists_buffer_and_keeps_batch_open(self) -> None:
+        with self.logger.batch():
+            self.logger.write("a", {})
+            self.logger.flush()
+            self.assertEqual(len(self._events()), 1)
+            self.logger.write("b", {})
+            self.assertEqual(len(self._events()), 1)
+        self.assertEqual([e["event_type"] for e in self._events()], ["a", "b"])
+
+    def test_concurrent_writes_and_flushes_lose_nothing(self) -> None:
+        self.logger.batch_flush_every = 7
+
+        def worker(n: int) -> None:
+            for i in range(200):
+                self.logger.write("evt", {"worker": n, "i": i, "pad": "x" * 4096})
+                if i % 13 == 0:
+                    self.logger.flush()
+
+        append = JsonlLogger._append
+
+        def slow_append(logger: JsonlLogger, lines: list[str]) -> None:
+            time.sleep(random.uniform(0, 0.002))  # uneven gaps between taking a buffer and writing it
+            append(logger, lines)
+
+        with mock.patch.object(JsonlLogger, "_append", slow_append), self.logger.batch():
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        events = self._events()  # every line must parse
+        self.assertEqual(len(events), 6 * 200)
+        for n in range(6):
+            seen = [e["payload"]["i"] for e in events if e["payload"]["worker"] == n]
+            self.assertEqual(seen, list(range(200)))
+
+    def test_later_flush_cannot_overtake_an_earlier_one(self) -> None:
+        append = JsonlLogger._append
+        first_taken = threading.Event()
+        overtaken = threading.Event()
+
+        def gated_append(logger: JsonlLogger, lines: list[str]) -> None:
+            if not first_taken.is_set():
+                first_taken.set()
+                overtaken.wait(0.2)  # a racing second flush would write here, ahead of these lines
+            append(logger, lines)
+
+        with mock.patch.object(JsonlLogger, "_append", gated_append), self.logger.batch():
+            self.logger.write("a", {})
+            first = threading.Thread(target=self.logger.flush)
+            first.start()
+            first_taken.wait(1)
+            self.logger.write("b", {})
+            self.logger.flush()
+            overtaken.set()
+            first.join()
+        self.assertEqual([e["event_type"] for e in self._events()], ["a", "b"])
+
+    def test_write_outside_batch_redacts_and_appends(self) -> None:
+        self.logger.write("api_call", {"api_key": "abc", "detail": "ok"})
+        self.assertEqual(self._events()[0]["payload"], {"api_key": "[REDACTED]", "detail": "ok"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,15 +8,23 @@ from pathlib import Path
 from leadgen.crm_store import CrmStore
 from leadgen.time_utils import UTC
 
+from helpers import clear_tables, force_update
+
 
 class PricingEngineTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.tmp = tempfile.TemporaryDirectory()
-        self.db = Path(self.tmp.name) / "pipeline.db"
-        self.store = CrmStore(self.db)
+    # One schema for the whole class; each test starts from emptied tables.
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db = Path(cls.tmp.name) / "pipeline.db"
+        cls.store = CrmStore(cls.db)
 
-    def tearDown(self) -> None:
-        self.tmp.cleanup()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp.cleanup()
+
+    def setUp(self) -> None:
+        clear_tables(self.db)
 
     def _new_lead(self, idx: int = 1) -> int:
         return self.store.upsert_lead_from_row(
@@ -50,8 +58,9 @@ class PricingEngineTests(unittest.TestCase):
         self.assertEqual(st.price_level, 1)
 
         # Ten offers without sale should bring it down one level.
-        for i in range(10):
-            out = self.store.record_offer_snapshot(lead_id=lead_id, run_id=f"run-window-{i}")
+        with self.store.transaction():
+            for i in range(10):
+                out = self.store.record_offer_snapshot(lead_id=lead_id, run_id=f"run-window-{i}")
         st2 = self.store.get_pricing_state()
         self.assertTrue(out["window_closed"])
         self.assertEqual(st2.price_level, 0)
@@ -72,16 +81,41 @@ class PricingEngineTests(unittest.TestCase):
         self.store.update_stage(lead_id, "WAITING_REPLY")
         # Force touch timestamp to 8 days ago.
         old_ts = (datetime.now(UTC) - timedelta(days=8)).isoformat()
-        import sqlite3
-
-        with sqlite3.connect(self.db) as conn:
-            conn.execute("UPDATE touches SET timestamp_utc=? WHERE lead_id=?", (old_ts, lead_id))
-            conn.commit()
+        force_update(self.db, "UPDATE touches SET timestamp_utc=? WHERE lead_id=?", (old_ts, lead_id))
         lost_ids = self.store.close_expired_sequences(max_days=7)
         self.assertIn(lead_id, lost_ids)
         ctx = self.store.get_lead_sale_context(lead_id)
         self.assertEqual(ctx["stage"], "LOST")
 
+    def test_first_touch_epoch_matches_iso_timestamp(self) -> None:
+        lead_id = self._new_lead(4)
+        self.store.save_touch(
+            lead_id=lead_id,
+            channel="EMAIL",
+            intent="OFFER",
+            template_id="email_offer",
+            status="sent",
+            provider_message_id="m1",
+            body="body",
+        )
+        iso = self.store.get_first_touch_timestamp(lead_id, intent="OFFER")
+        epoch = self.store.get_first_touch_epoch(lead_id, intent="OFFER")
+        self.assertEqual(epoch, int(datetime.fromisoformat(iso).timestamp()))
+        self.assertEqual(self.store.get_first_touch_epoch(lead_id, intent="CONSENT_REQUEST"), 0)
+
+        # Rewriting timestamp_utc moves the epoch with it.
+        old = datetime.now(UTC) - timedelta(days=3)
+        force_update(self.db, "UPDATE touches SET timestamp_utc=? WHERE lead_id=?", (old.isoformat(), lead_id))
+        self.assertEqual(self.store.get_first_touch_epoch(lead_id, intent="OFFER"), int(old.timestamp()))
+
+    def test_opt_out_set_matches_single_lookup(self) -> None:
+        self._new_lead(5)
+        self.store.register_opt_out("Lead5@Example.com", "EMAIL", reason="reply_stop")
+        opt_outs = self.store.load_opt_out_set()
+        self.assertIn(self.store.opt_out_key("lead5@example.com", "EMAIL"), opt_outs)
+        self.assertNotIn(self.store.opt_out_key("lead5@example.com", "WHATSAPP"), opt_outs)
+        self.assertTrue(self.store.is_opted_out("lead5@example.com", "EMAIL"))
+
 
 class ReplyQueueTests(unittest.TestCase):
     def test_queue_lifecycle(self) -> None:
@@ -111,5 +145,31 @@ class ReplyQueueTests(unittest.TestCase):
             self.assertEqual(item3.status, "SENT")
 
 
+class LeadIteratorTests(unittest.TestCase):
+    def test_paged_iteration_respects_limit_and_allows_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CrmStore(Path(tmp) / "pipeline.db")
+            ids = [
+                store.upsert_lead_from_row(
+                    run_id="test-run",
+                    row={
+                        "name": f"Lead {i}",
+                        "phone": "5531999990000" if i % 2 else "",
+                        "website_emails": "" if i % 2 else f"it{i}@example.com",
+                        "maps_url": f"https://maps.google.com/?cid=it{i}",
+                        "address": "Belo Horizonte MG",
+                    },
+                )
+                for i in range(6)
+            ]
+            seen = []
+            for lead in store.iter_leads_for_initial_contact(limit=5, page_size=2):
+                store.update_stage(lead.id, "WAITING_REPLY")
+                seen.append(lead.id)
+            self.assertEqual(seen, [ids[0], ids[2], ids[4], ids[1], ids[3]])
+            waiting = [lead.id for lead in store.iter_leads_waiting_reply(limit=10, page_size=2)]
+            self.assertEqual(waiting, sorted(seen))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import unittest
+
+from leadgen.outreach import classify_reply, is_opt_out_reply
+
+OPT_OUTS = ["PARAR", " stop ", "Sair", "unsubscribe", "cancelar", "remove\n"]
+NOT_OPT_OUTS = ["", "STOP.", "Sair!", "stop by tomorrow?", "pode parar de ligar depois", "stopped"]
+
+
+class ReplyClassificationTests(unittest.TestCase):
+    # api_server checks is_opt_out_reply(); process_reply relies on classify_reply()'s label. Both must agree.
+    def test_whole_reply_keyword_is_opt_out_for_both_callers(self) -> None:
+        for text in OPT_OUTS:
+            self.assertTrue(is_opt_out_reply(text), text)
+            self.assertEqual(classify_reply(text), ("opt_out", 0.99))
+
+    def test_other_replies_are_not_opt_out_for_either_caller(self) -> None:
+        for text in NOT_OPT_OUTS:
+            self.assertFalse(is_opt_out_reply(text), text)
+            self.assertNotEqual(classify_reply(text)[0], "opt_out", text)
+
+    def test_positive_reply_still_classified(self) -> None:
+        self.assertEqual(classify_reply("Sim, quero ver")[0], "positive")
+
+
+if __name__ == "__main__":
+    unittest.main()
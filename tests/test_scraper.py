@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+class ScraperImportTests(unittest.TestCase):
+    def test_runners_import_without_loading_playwright(self) -> None:
+        code = "import sys, leadgen.runner, leadgen.pipeline_runner; print('playwright' in sys.modules)"
+        env = {**os.environ, "PYTHONPATH": str(SRC)}
+        out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from leadgen.sqlite_utils import ThreadLocalConnections
+
+
+class ThreadLocalConnectionsTests(unittest.TestCase):
+    def test_reuses_connection_per_thread_and_enables_wal(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            conns = ThreadLocalConnections(Path(tmp) / "state.db")
+            first = conns.get()
+            self.assertIs(conns.get(), first)
+            self.assertEqual(first.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+            other: list[object] = []
+            worker = threading.Thread(target=lambda: other.append(conns.get()))
+            worker.start()
+            worker.join()
+            self.assertIsNot(other[0], first)
+
+    def test_finished_threads_connections_are_closed_and_close_all_reconnects(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            conns = ThreadLocalConnections(Path(tmp) / "state.db")
+            worker_conns: list[sqlite3.Connection] = []
+            worker = threading.Thread(target=lambda: worker_conns.append(conns.get()))
+            worker.start()
+            worker.join()
+
+            first = conns.get()  # opening a connection closes the one the finished worker left behind
+            with self.assertRaises(sqlite3.ProgrammingError):
+                worker_conns[0].execute("SELECT 1")
+
+            conns.close_all()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                first.execute("SELECT 1")
+            self.assertEqual(conns.get().execute("SELECT 1").fetchone()[0], 1)
+            conns.close_all()
+
+    def test_transaction_commits_once_and_rolls_back_on_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            conns = ThreadLocalConnections(Path(tmp) / "state.db")
+            with conns.get() as conn:
+                conn.execute("CREATE TABLE t (v INTEGER)")
+                conn.commit()
+
+            def insert(value: int) -> None:
+                with conns.get() as conn:
+                    conn.execute("INSERT INTO t (v) VALUES (?)", (value,))
+                    conn.commit()
+
+            with conns.transaction():
+                insert(1)
+                insert(2)
+                self.assertTrue(conns.get().in_transaction)
+            self.assertFalse(conns.get().in_transaction)
+
+            with self.assertRaises(RuntimeError):
+                with conns.transaction():
+                    insert(3)
+                    raise RuntimeError("boom")
+            self.assertEqual([r[0] for r in conns.get().execute("SELECT v FROM t ORDER BY v")], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
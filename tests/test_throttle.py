@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import unittest
+
+from leadgen.throttle import SendThrottle, is_rate_limited
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class SendThrottleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _FakeClock()
+        self.throttle = SendThrottle(min_delay_seconds=0.5, max_delay_seconds=10, sleep=self.clock.sleep, clock=self.clock)
+
+    def test_first_send_does_not_wait(self) -> None:
+        self.assertEqual(self.throttle.wait_and_mark("EMAIL"), 0.0)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_healthy_channel_waits_only_min_delay(self) -> None:
+        self.throttle.wait_and_mark("EMAIL")
+        self.throttle.record_send("EMAIL", latency_ms=100, status="sent", detail="")
+        waited = self.throttle.wait_and_mark("EMAIL")
+        self.assertAlmostEqual(waited, 0.5)
+
+    def test_rate_limit_pauses_and_widens_delay(self) -> None:
+        self.throttle.wait_and_mark("EMAIL")
+        limited = self.throttle.record_send("EMAIL", latency_ms=100, status="http_error", detail="429")
+        self.assertTrue(limited)
+        state = self.throttle.state("EMAIL")
+        self.assertEqual(state.rate_limit_count, 1)
+        self.assertAlmostEqual(state.min_delay, 0.75)
+        waited = self.throttle.wait_and_mark("EMAIL")
+        self.assertAlmostEqual(waited, 30.0)
+
+    def test_channels_are_independent(self) -> None:
+        self.throttle.wait_and_mark("EMAIL")
+        self.throttle.record_send("EMAIL", latency_ms=100, status="http_error", detail="429")
+        self.assertEqual(self.throttle.wait_and_mark("WHATSAPP"), 0.0)
+
+    def test_concurrent_callers_reserve_distinct_slots(self) -> None:
+        # Callers that have not finished sleeping yet still get spaced-out send slots.
+        throttle = SendThrottle(min_delay_seconds=0.5, max_delay_seconds=10, sleep=lambda _s: None, clock=self.clock)
+        waits = [throttle.wait_and_mark("EMAIL") for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.5, 1.0])
+
+    def test_unpaced_throttle_skips_spacing_but_keeps_rate_limit_pause(self) -> None:
+        throttle = SendThrottle(min_delay_seconds=0.5, max_delay_seconds=10, sleep=self.clock.sleep, clock=self.clock, pace=False)
+        throttle.wait_and_mark("EMAIL")
+        throttle.record_send("EMAIL", latency_ms=2000, status="sent", detail="")
+        self.assertEqual(throttle.wait_and_mark("EMAIL"), 0.0)
+        throttle.record_send("EMAIL", latency_ms=100, status="http_error", detail="429")
+        self.assertAlmostEqual(throttle.wait_and_mark("EMAIL"), 30.0)
+
+    def test_rate_limit_detection(self) -> None:
+        self.assertTrue(is_rate_limited("http_error", "429"))
+        self.assertTrue(is_rate_limited("network_error", "Too Many Requests"))
+        self.assertTrue(is_rate_limited("http_error", "503 Service Unavailable"))
+        self.assertTrue(is_rate_limited("rate_limited", ""))
+        self.assertFalse(is_rate_limited("http_error", "500"))
+        self.assertFalse(is_rate_limited("sent", "msg-14290"))
+        self.assertFalse(is_rate_limited("sent", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()